@@ -1,31 +1,154 @@
 from flask import Flask, render_template, request, jsonify, session, Response, make_response
-import json
+from flask.json.provider import JSONProvider
+import gzip
+import orjson
 import os
-import pytz
+import threading
 import uuid
 import time
+from collections import OrderedDict
 from datetime import datetime
+from operator import itemgetter
 
 import config
-from lib.geo import get_timezone_from_gps, calculate_track_distance, format_time
+from lib.geo import get_timezone_from_gps, calculate_track_distance, format_time, format_local_time, tz_from_name
 from lib.owntracks import fetch_owntracks_data
-from lib.activities import parse_activities, calculate_activity_stats, ride_stat_window
+from lib.activities import parse_activities, calculate_activity_stats
 from lib.live import save_live_state, load_live_state, clear_live_state
 
+class OrjsonProvider(JSONProvider):
+    """Serialize API responses with orjson.
+
+    The track and poll payloads carry tens of thousands of lat/lng floats;
+    orjson formats them in C, several times faster than the stdlib encoder
+    jsonify uses by default.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand the orjson bytes straight to the Response instead of
+        # decoding to str and letting Flask re-encode to UTF-8 - on the
+        # big track payloads that round-trip doubles peak memory
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY),
+            mimetype="application/json")
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.secret_key = config.FLASK_SECRET_KEY
 
+# Responses below this size aren't worth the gzip header overhead
+COMPRESS_MIN_SIZE = 1024
+
+
+@app.after_request
+def _gzip_response(response):
+    """Gzip large responses when the client accepts it.
+
+    The point payloads are highly repetitive JSON (the same three keys and
+    near-identical floats) and compress 5-8x, which matters most for the
+    phone polling over mobile data. Level 5 keeps the CPU cost small on
+    the Pi.
+    """
+    if (response.status_code != 200
+            or response.direct_passthrough
+            or response.headers.get('Content-Encoding')
+            or 'gzip' not in request.headers.get('Accept-Encoding', '')
+            or response.content_length is None
+            or response.content_length < COMPRESS_MIN_SIZE):
+        return response
+    response.set_data(gzip.compress(response.get_data(), compresslevel=5))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
 # In-memory store for detection results, keyed by session ID
-# Each browser/device gets its own cache to avoid conflicts
-_session_caches = {}
+# Each browser/device gets its own cache to avoid conflicts.
+# Bounded LRU: detection results hold full GPS tracks, so stale sessions
+# (old browsers, cleared cookies) must not accumulate forever.
+_session_caches = OrderedDict()
+MAX_SESSION_CACHES = 16
 
 
 def _get_cache():
-    """Get the cache for the current session. Creates session ID if needed."""
+    """Get the cache for the current session. Creates session ID if needed.
+
+    Evicts the least-recently-used session once MAX_SESSION_CACHES is hit.
+    """
     if 'cache_id' not in session:
         session['cache_id'] = str(uuid.uuid4())
-    return _session_caches.setdefault(session['cache_id'], {})
+    cache_id = session['cache_id']
+    if cache_id in _session_caches:
+        _session_caches.move_to_end(cache_id)
+        return _session_caches[cache_id]
+    while len(_session_caches) >= MAX_SESSION_CACHES:
+        _session_caches.popitem(last=False)
+    _session_caches[cache_id] = {}
+    return _session_caches[cache_id]
+
+
+# C-level extraction of the three fields every frontend payload needs
+_point_fields = itemgetter("lat", "lon", "tst")
+
 
+def _points_payload(points):
+    """Format GPS points for the frontend ({lat, lng, tst} dicts)."""
+    return [{"lat": lat, "lng": lon, "tst": tst}
+            for lat, lon, tst in map(_point_fields, points)]
+
+
+def _points_soa(points):
+    """Format GPS points as parallel arrays: {lat: [...], lng: [...], tst: [...]}.
+
+    On big point batches the three repeated key strings dominate the JSON
+    payload; the structure-of-arrays form roughly halves the bytes on the
+    wire and skips one dict allocation per point. The frontend expands it
+    back to point objects in one place (soaToPoints in app.js).
+    """
+    lat, lng, tst = [], [], []
+    for p_lat, p_lon, p_tst in map(_point_fields, points):
+        lat.append(p_lat)
+        lng.append(p_lon)
+        tst.append(p_tst)
+    return {"lat": lat, "lng": lng, "tst": tst}
+
+
+# Live poll cadence. The base matches the frontend's POLL_PERIOD_S (the
+# iPhone's ~65s send cadence plus headroom). When consecutive polls come
+# back empty (phone at home, tracking paused) the server suggests backing
+# off to 2x then 4x, trading up to a couple of minutes of latency on the
+# first fix after an idle stretch for a 2-4x cut in per-session CPU and
+# OwnTracks queries. One fresh point snaps the cadence back to the base.
+LIVE_POLL_BASE_MS = 65 * 1000
+LIVE_POLL_BACKOFF_STEPS = [(6, 4), (3, 2)]  # (idle polls, interval multiplier)
+
+
+# Polls landing within this window of another device's fetch reuse its
+# result instead of hitting OwnTracks again (multi-device join case)
+LIVE_FETCH_COALESCE_S = 2
+_live_fetch_lock = threading.Lock()
+
+
+def _next_poll_interval_ms(idle_polls):
+    for threshold, factor in LIVE_POLL_BACKOFF_STEPS:
+        if idle_polls >= threshold:
+            return LIVE_POLL_BASE_MS * factor
+    return LIVE_POLL_BASE_MS
+
+
+# Per-ride polyline colors, cycled per activity type
+RIDE_COLORS = {
+    'car': ['#FF0000', '#FF8C00', '#FFD700', '#FF1493', '#8B0000'],
+    'bike': ['#FF8C00', '#228B22', '#1E90FF', '#8B4513', '#4B0082', '#DC143C', '#00CED1'],
+    'other': ['#800080', '#FF00FF', '#FFA500', '#00FFFF', '#8B4513']
+}
 
 # Live mode cache - shared across all sessions (single live mode per server)
 _live_cache = {
@@ -36,7 +159,10 @@ _live_cache = {
     'gps_points': [],
     'activities': {},
     'activity_stats': {},
-    'raw_data': []
+    'raw_data': [],
+    'raw_tsts': set(),
+    'idle_polls': 0,
+    'parse_gen': 0
 }
 
 
@@ -51,7 +177,10 @@ def _reset_live_cache():
         'gps_points': [],
         'activities': {},
         'activity_stats': {},
-        'raw_data': []
+        'raw_data': [],
+        'raw_tsts': set(),
+        'idle_polls': 0,
+        'parse_gen': 0
     }
 
 
@@ -112,25 +241,32 @@ def detect_activities():
         return jsonify({"success": False, "error": "No GPS location points found to determine timezone"}), 404
 
     detected_tz = get_timezone_from_gps(first_gps_point["lat"], first_gps_point["lon"])
-    tz_name = detected_tz.zone
-
-    # Phase 2: Precise fetch with correct timezone
-    raw_data, upstream_status = fetch_owntracks_data(
-        start_date, end_date, start_time, end_time,
-        server_ip=config.OWNTRACKS_SERVER_IP,
-        server_port=config.OWNTRACKS_SERVER_PORT,
-        user=config.OWNTRACKS_USER,
-        device_id=config.OWNTRACKS_DEVICE_ID,
-        target_timezone=detected_tz,
-        default_timezone=config.DEFAULT_TIMEZONE,
-        return_status=True
-    )
+    tz_name = str(detected_tz)
+
+    # Common case: a full single day in the home timezone. The discovery
+    # fetch already covered exactly that window, so reuse it instead of
+    # asking the recorder for the same data a second time.
+    if (start_date == end_date and start_time == "00:00" and end_time == "23:59"
+            and tz_name == config.DEFAULT_TIMEZONE):
+        raw_data = discovery_data
+    else:
+        # Phase 2: Precise fetch with correct timezone
+        raw_data, upstream_status = fetch_owntracks_data(
+            start_date, end_date, start_time, end_time,
+            server_ip=config.OWNTRACKS_SERVER_IP,
+            server_port=config.OWNTRACKS_SERVER_PORT,
+            user=config.OWNTRACKS_USER,
+            device_id=config.OWNTRACKS_DEVICE_ID,
+            target_timezone=detected_tz,
+            default_timezone=config.DEFAULT_TIMEZONE,
+            return_status=True
+        )
 
-    if upstream_status == "unavailable":
-        return jsonify({
-            "success": False,
-            "error": "Could not reach the tracking server. Try a shorter date range."
-        }), 502
+        if upstream_status == "unavailable":
+            return jsonify({
+                "success": False,
+                "error": "Could not reach the tracking server. Try a shorter date range."
+            }), 502
 
     if not raw_data:
         return jsonify({
@@ -151,10 +287,10 @@ def detect_activities():
     cache["activities"] = activities
     cache["activity_stats"] = activity_stats
     cache["detected_tz"] = detected_tz
-    cache["raw_data"] = raw_data
+    cache.pop("all_stats", None)  # invalidate the 'all' layer memo
 
-    # Build timeline
-    lwt_markers = [item for item in raw_data if item.get("_type") == "lwt" and item.get("custom") is True]
+    # Build timeline (markers were already collected during parsing)
+    lwt_markers = activities['_lwt_markers']
     timeline = _build_timeline(gps_points, activities, lwt_markers, detected_tz)
 
     # Format stats for JSON response
@@ -179,13 +315,12 @@ def detect_activities():
             for ride_idx, ride in enumerate(activities[activity_type]):
                 if not ride['points']:
                     continue
-                start_timestamp, end_timestamp = ride_stat_window(ride)
-                start_local = datetime.fromtimestamp(start_timestamp, tz=pytz.UTC).astimezone(detected_tz)
-                end_local = datetime.fromtimestamp(end_timestamp, tz=pytz.UTC).astimezone(detected_tz)
-
-                ride_distance = calculate_track_distance(ride['points'])
+                # Per-ride aggregates are cached by calculate_activity_stats
+                start_timestamp = ride['stat_start']
+                end_timestamp = ride['stat_end']
 
-                ride_duration = end_timestamp - start_timestamp
+                ride_distance = ride['distance']
+                ride_duration = ride['duration']
                 avg_speed = (ride_distance / ride_duration * 3600) if ride_duration > 0 else 0
 
                 rides_summary.append({
@@ -193,8 +328,8 @@ def detect_activities():
                     'ride_number': ride_idx + 1,
                     'start_timestamp': start_timestamp,
                     'end_timestamp': end_timestamp,
-                    'start_datetime_str': start_local.strftime('%b %d, %H:%M:%S'),
-                    'end_datetime_str': end_local.strftime('%b %d, %H:%M:%S'),
+                    'start_datetime_str': format_local_time(start_timestamp, detected_tz, '%b %d, %H:%M:%S'),
+                    'end_datetime_str': format_local_time(end_timestamp, detected_tz, '%b %d, %H:%M:%S'),
                     'distance': round(ride_distance, 2),
                     'duration': ride_duration,
                     'avg_speed': round(avg_speed, 1),
@@ -202,7 +337,7 @@ def detect_activities():
                 })
 
     # Sort by start timestamp descending (most recent first)
-    rides_summary.sort(key=lambda x: x['start_timestamp'], reverse=True)
+    rides_summary.sort(key=itemgetter('start_timestamp'), reverse=True)
 
     return jsonify({
         "success": True,
@@ -215,6 +350,24 @@ def detect_activities():
     })
 
 
+def _all_layer_stats(cache, gps_points, activity_stats):
+    """Stats for the 'all' layer, computed once per detection.
+
+    'all' is the only layer without an activity_stats entry, so its O(N)
+    distance pass is memoized in the session cache. detect_activities
+    clears the memo when it stores a new detection.
+    """
+    stats = cache.get("all_stats")
+    if stats is None:
+        stats = {
+            'total_distance': calculate_track_distance(gps_points),
+            'total_duration': gps_points[-1]["tst"] - gps_points[0]["tst"] if len(gps_points) > 1 else 0,
+            'count': sum(activity_stats.get(a, {}).get('count', 0) for a in ['car', 'bike', 'other'])
+        }
+        cache["all_stats"] = stats
+    return stats
+
+
 @app.route("/api/track/<activity_type>")
 def get_track_data(activity_type):
     cache = _get_cache()
@@ -226,42 +379,32 @@ def get_track_data(activity_type):
     activity_stats = cache["activity_stats"]
     detected_tz = cache["detected_tz"]
 
-    ride_colors = {
-        'car': ['#FF0000', '#FF8C00', '#FFD700', '#FF1493', '#8B0000'],
-        'bike': ['#FF8C00', '#228B22', '#1E90FF', '#8B4513', '#4B0082', '#DC143C', '#00CED1'],
-        'other': ['#800080', '#FF00FF', '#FFA500', '#00FFFF', '#8B4513']
-    }
-
     if activity_type == 'all':
         if not gps_points:
             return jsonify({"success": False, "error": "No GPS points available"}), 404
 
-        layer_distance = calculate_track_distance(gps_points)
-        layer_duration = gps_points[-1]["tst"] - gps_points[0]["tst"] if len(gps_points) > 1 else 0
-
-        start_local = datetime.fromtimestamp(gps_points[0]['tst'], tz=pytz.UTC).astimezone(detected_tz)
-        end_local = datetime.fromtimestamp(gps_points[-1]['tst'], tz=pytz.UTC).astimezone(detected_tz)
+        all_stats = _all_layer_stats(cache, gps_points, activity_stats)
 
         return jsonify({
             "success": True,
             "activity_type": "all",
             "mode": "basic",
-            "points": [{"lat": p["lat"], "lng": p["lon"], "tst": p["tst"]} for p in gps_points],
+            "points": _points_payload(gps_points),
             "stats": {
-                "distance": round(layer_distance, 2),
-                "duration": layer_duration,
-                "rides": sum(activity_stats.get(a, {}).get('count', 0) for a in ['car', 'bike', 'other']),
+                "distance": round(all_stats['total_distance'], 2),
+                "duration": all_stats['total_duration'],
+                "rides": all_stats['count'],
                 "points": len(gps_points)
             },
-            "start_time_str": start_local.strftime('%H:%M:%S'),
-            "end_time_str": end_local.strftime('%H:%M:%S'),
-            "tz_name": detected_tz.zone
+            "start_time_str": format_local_time(gps_points[0]['tst'], detected_tz, '%H:%M:%S'),
+            "end_time_str": format_local_time(gps_points[-1]['tst'], detected_tz, '%H:%M:%S'),
+            "tz_name": str(detected_tz)
         })
 
     if activity_type not in activities or not activities[activity_type]:
         return jsonify({"success": False, "error": f"No {activity_type} activities found"}), 404
 
-    colors = ride_colors.get(activity_type, ['#FFA500'])
+    colors = RIDE_COLORS.get(activity_type, ['#FFA500'])
     rides_data = []
 
     for ride_idx, ride in enumerate(activities[activity_type]):
@@ -269,25 +412,23 @@ def get_track_data(activity_type):
             continue
 
         color = colors[ride_idx % len(colors)]
-        start_timestamp, end_timestamp = ride_stat_window(ride)
-
-        start_local = datetime.fromtimestamp(start_timestamp, tz=pytz.UTC).astimezone(detected_tz)
-        end_local = datetime.fromtimestamp(end_timestamp, tz=pytz.UTC).astimezone(detected_tz)
-
-        ride_distance = calculate_track_distance(ride['points'])
+        # Per-ride aggregates are cached by calculate_activity_stats
+        start_timestamp = ride['stat_start']
+        end_timestamp = ride['stat_end']
 
-        ride_duration = end_timestamp - start_timestamp
+        ride_distance = ride['distance']
+        ride_duration = ride['duration']
         avg_speed = (ride_distance / ride_duration * 3600) if ride_duration > 0 else 0
 
         rides_data.append({
             'ride_number': ride_idx + 1,
             'start_timestamp': start_timestamp,
             'end_timestamp': end_timestamp,
-            'start_time_str': start_local.strftime('%H:%M:%S'),
-            'end_time_str': end_local.strftime('%H:%M:%S'),
-            'start_datetime_str': start_local.strftime('%b %d, %H:%M:%S'),
-            'end_datetime_str': end_local.strftime('%b %d, %H:%M:%S'),
-            'points': [{"lat": p["lat"], "lng": p["lon"], "tst": p["tst"]} for p in ride['points']],
+            'start_time_str': format_local_time(start_timestamp, detected_tz, '%H:%M:%S'),
+            'end_time_str': format_local_time(end_timestamp, detected_tz, '%H:%M:%S'),
+            'start_datetime_str': format_local_time(start_timestamp, detected_tz, '%b %d, %H:%M:%S'),
+            'end_datetime_str': format_local_time(end_timestamp, detected_tz, '%b %d, %H:%M:%S'),
+            'points': _points_payload(ride['points']),
             'distance': round(ride_distance, 2),
             'duration': ride_duration,
             'avg_speed': round(avg_speed, 1),
@@ -307,7 +448,7 @@ def get_track_data(activity_type):
             "rides": stats.get('count', 0),
             "points": stats.get('total_points', 0)
         },
-        "tz_name": detected_tz.zone
+        "tz_name": str(detected_tz)
     })
 
 
@@ -332,12 +473,6 @@ def save_map():
     saved_layers_data = {}
     saved_rides_data = {}
 
-    ride_colors = {
-        'car': ['#FF0000', '#FF8C00', '#FFD700', '#FF1493', '#8B0000'],
-        'bike': ['#FF8C00', '#228B22', '#1E90FF', '#8B4513', '#4B0082', '#DC143C', '#00CED1'],
-        'other': ['#800080', '#FF00FF', '#FFA500', '#00FFFF', '#8B4513']
-    }
-
     for layer_type in active_layers:
         if layer_type == 'all':
             points = gps_points
@@ -345,7 +480,7 @@ def save_map():
             points = []
             for ride in activities[layer_type]:
                 points.extend(ride['points'])
-            points.sort(key=lambda x: x['tst'])
+            points.sort(key=itemgetter('tst'))
         else:
             continue
 
@@ -358,40 +493,38 @@ def save_map():
             layer_duration = stats.get('total_duration', 0)
             layer_rides = stats.get('count', 0)
         else:
-            layer_distance = calculate_track_distance(points)
-            layer_duration = points[-1]["tst"] - points[0]["tst"] if len(points) > 1 else 0
-            layer_rides = sum(activity_stats.get(a, {}).get('count', 0) for a in ['car', 'bike', 'other'])
-
-        start_local = datetime.fromtimestamp(points[0]['tst'], tz=pytz.UTC).astimezone(detected_tz)
-        end_local = datetime.fromtimestamp(points[-1]['tst'], tz=pytz.UTC).astimezone(detected_tz)
+            # 'all' is the only layer without an activity_stats entry
+            all_stats = _all_layer_stats(cache, gps_points, activity_stats)
+            layer_distance = all_stats['total_distance']
+            layer_duration = all_stats['total_duration']
+            layer_rides = all_stats['count']
 
         saved_layers_data[layer_type] = {
-            'points': [{'lat': p['lat'], 'lng': p['lon'], 'tst': p['tst']} for p in points],
+            'points': _points_payload(points),
             'stats': {
                 'distance': layer_distance,
                 'duration': layer_duration,
                 'rides': layer_rides,
                 'points': len(points),
-                'start_time_str': start_local.strftime('%H:%M:%S'),
-                'end_time_str': end_local.strftime('%H:%M:%S')
+                'start_time_str': format_local_time(points[0]['tst'], detected_tz, '%H:%M:%S'),
+                'end_time_str': format_local_time(points[-1]['tst'], detected_tz, '%H:%M:%S')
             }
         }
 
         if layer_type in ['car', 'bike', 'other'] and layer_type in activities:
-            colors = ride_colors.get(layer_type, ['#FFA500'])
+            colors = RIDE_COLORS.get(layer_type, ['#FFA500'])
             saved_rides_data[layer_type] = []
             for ride_idx, ride in enumerate(activities[layer_type]):
                 if not ride['points']:
                     continue
-                stat_start, stat_end = ride_stat_window(ride)
-                s_local = datetime.fromtimestamp(stat_start, tz=pytz.UTC).astimezone(detected_tz)
-                e_local = datetime.fromtimestamp(stat_end, tz=pytz.UTC).astimezone(detected_tz)
+                stat_start, stat_end = ride['stat_start'], ride['stat_end']
                 saved_rides_data[layer_type].append({
                     'start': stat_start,
                     'end': stat_end,
-                    'points': [{'lat': p['lat'], 'lng': p['lon'], 'tst': p['tst']} for p in ride['points']],
-                    'start_time_str': s_local.strftime('%b %d, %H:%M:%S'),
-                    'end_time_str': e_local.strftime('%b %d, %H:%M:%S'),
+                    'distance': ride['distance'],
+                    'points': _points_payload(ride['points']),
+                    'start_time_str': format_local_time(stat_start, detected_tz, '%b %d, %H:%M:%S'),
+                    'end_time_str': format_local_time(stat_end, detected_tz, '%b %d, %H:%M:%S'),
                     'color': colors[ride_idx % len(colors)]
                 })
 
@@ -404,23 +537,16 @@ def save_map():
     timestamp = now.strftime("%Y-%m-%d_%H-%M-%S")
     filename = f"interactive_map_{date_str}_{layer_names}_{timestamp}.html"
 
-    # Generate self-contained HTML
-    html = _generate_saved_map_html(
-        saved_layers_data, saved_rides_data,
+    # Generate and write the self-contained HTML off the request thread -
+    # it embeds the full point payload and can reach tens of MB
+    saved_path = _start_saved_map_write(
+        filename, saved_layers_data, saved_rides_data,
         date_range=f"{start_date} to {end_date}",
         active_layers=active_layers,
         total_points=len(gps_points),
         saved_timestamp=now.strftime("%Y-%m-%d %H:%M:%S")
     )
 
-    # Save to saved_maps directory
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    saved_maps_dir = os.path.join(script_dir, "saved_maps")
-    os.makedirs(saved_maps_dir, exist_ok=True)
-    saved_path = os.path.join(saved_maps_dir, filename)
-    with open(saved_path, 'w', encoding='utf-8', newline='') as f:
-        f.write(html)
-
     return jsonify({
         "success": True,
         "filename": filename,
@@ -430,14 +556,51 @@ def save_map():
     })
 
 
-def _generate_saved_map_html(saved_layers_data, saved_rides_data, date_range, active_layers, total_points, saved_timestamp):
+def _start_saved_map_write(filename, saved_layers_data, saved_rides_data,
+                           date_range, active_layers, total_points, saved_timestamp):
+    """Kick off saved-map generation in a background thread.
+
+    Returns the destination path immediately; the heavy HTML build and the
+    disk write happen after the response is sent.
+    """
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    saved_maps_dir = os.path.join(script_dir, "saved_maps")
+    os.makedirs(saved_maps_dir, exist_ok=True)
+    saved_path = os.path.join(saved_maps_dir, filename)
+
+    def write_map():
+        try:
+            head, mid, tail = _saved_map_html_parts(
+                date_range=date_range,
+                active_layers=active_layers,
+                total_points=total_points,
+                saved_timestamp=saved_timestamp
+            )
+            # Emit the page in segments, with the two JSON blobs written as
+            # raw orjson bytes between them: peak memory is one blob rather
+            # than the fully concatenated page, and I/O starts before the
+            # second blob is serialized.
+            with open(saved_path, 'wb', buffering=1 << 20) as f:
+                f.write(head.encode('utf-8'))
+                f.write(orjson.dumps(saved_layers_data))
+                f.write(mid.encode('utf-8'))
+                f.write(orjson.dumps(saved_rides_data))
+                f.write(tail.encode('utf-8'))
+        except Exception as e:
+            print(f"[ERROR] Failed to write saved map {saved_path}: {str(e)}")
+
+    threading.Thread(target=write_map, daemon=True).start()
+    return saved_path
+
+
+def _saved_map_html_parts(date_range, active_layers, total_points, saved_timestamp):
+    """Build the saved-map page as (head, mid, tail) strings surrounding the
+    two embedded JSON blobs, which the writer streams in between as bytes."""
     title = f"GPS Multi-Layer Tracking - {date_range} ({len(active_layers)} layers)"
-    layers_json = json.dumps(saved_layers_data)
-    rides_json = json.dumps(saved_rides_data)
     api_key = config.GOOGLE_MAPS_API_KEY
     layers_list = ', '.join(active_layers)
 
-    return f"""<!DOCTYPE html>
+    head = f"""<!DOCTYPE html>
 <html>
 <head>
     <title>{title}</title>
@@ -447,8 +610,9 @@ def _generate_saved_map_html(saved_layers_data, saved_rides_data, date_range, ac
         var activityLayers = {{}};
         var layerVisibility = {{}};
 
-        var savedLayersData = {layers_json};
-        var savedRidesData = {rides_json};
+        var savedLayersData = """
+    mid = ";\n        var savedRidesData = "
+    tail = f""";
 
         var activityConfig = {{
             'car': {{ color: '#FF4444', icon: '\\u{{1F697}}', name: 'Car' }},
@@ -537,15 +701,8 @@ def _generate_saved_map_html(saved_layers_data, saved_rides_data, date_range, ac
             var rideDuration = ride.end - ride.start;
             var dh = Math.floor(rideDuration / 3600);
             var dm = Math.floor((rideDuration % 3600) / 60);
-            var rideDistance = 0;
-            for (var i = 1; i < points.length; i++) {{
-                var la1=points[i-1].lat*Math.PI/180, lo1=points[i-1].lng*Math.PI/180;
-                var la2=points[i].lat*Math.PI/180, lo2=points[i].lng*Math.PI/180;
-                var dla=la2-la1, dlo=lo2-lo1;
-                var a=Math.sin(dla/2)*Math.sin(dla/2)+Math.cos(la1)*Math.cos(la2)*Math.sin(dlo/2)*Math.sin(dlo/2);
-                var sd=6371*2*Math.atan2(Math.sqrt(a),Math.sqrt(1-a));
-                if(sd>=0.01) rideDistance+=sd*1.05;
-            }}
+            // Distance is precomputed server-side; no need to redo the haversine loop here
+            var rideDistance = ride.distance || 0;
             var avgSpeed = rideDuration > 0 ? (rideDistance / rideDuration * 3600) : 0;
 
             var sm = new google.maps.Marker({{
@@ -703,12 +860,120 @@ def _generate_saved_map_html(saved_layers_data, saved_rides_data, date_range, ac
     </div>
 </body>
 </html>"""
+    return head, mid, tail
 
 
 # =============================================================================
 # Live Mode Endpoints
 # =============================================================================
 
+def _live_total_distance(gps_points):
+    """Running track distance for the live session, extended incrementally.
+
+    New fixes normally append to the tail, so the cached total is extended
+    with just the segment from the previous last point onward. Batched
+    historical uploads can interleave earlier points after the merge sort;
+    the tail fingerprint check catches that and falls back to a full
+    recompute. Points pruned to the disk archive are covered by the
+    archived_distance offset so the total still spans the whole session.
+    """
+    prev_n = _live_cache.get('dist_n', 0)
+    if (prev_n and len(gps_points) >= prev_n
+            and gps_points[prev_n - 1]['tst'] == _live_cache.get('dist_last_tst')):
+        if len(gps_points) > prev_n:
+            _live_cache['dist_total'] += calculate_track_distance(gps_points[prev_n - 1:])
+    else:
+        _live_cache['dist_total'] = (_live_cache.get('archived_distance', 0.0)
+                                     + calculate_track_distance(gps_points))
+    _live_cache['dist_n'] = len(gps_points)
+    _live_cache['dist_last_tst'] = gps_points[-1]['tst'] if gps_points else None
+    return _live_cache['dist_total']
+
+
+# Bound on in-memory raw items for a live session (~2 weeks at the 65s
+# cadence). Beyond it the oldest fixes are appended to a JSONL archive on
+# disk and dropped from memory, so a long-running session's RSS stays flat.
+MAX_LIVE_RAW_ITEMS = 20000
+
+
+def _live_archive_path():
+    start_ts = _live_cache.get('start_timestamp')
+    if not start_ts:
+        return None
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(script_dir, 'saved_maps', f'live_archive_{start_ts}.jsonl')
+
+
+def _prune_live_raw():
+    """Archive the oldest live fixes to disk once the in-memory cap is hit.
+
+    Prunes down to 3/4 of the cap so eviction runs rarely, not per poll.
+    Only location items are archived; lwt markers stay in memory because
+    parse_activities needs the full marker history to pair rides. The
+    distance covered by evicted points (plus the boundary segment into the
+    surviving head) is folded into archived_distance, and first_fix_tst
+    keeps session duration anchored at the true start.
+    """
+    raw = _live_cache['raw_data']
+    if len(raw) <= MAX_LIVE_RAW_ITEMS:
+        return
+
+    cut = len(raw) - (MAX_LIVE_RAW_ITEMS * 3 // 4)
+    head, tail = raw[:cut], raw[cut:]
+    evicted = [item for item in head if item.get('_type') == 'location']
+    keep = [item for item in head if item.get('_type') != 'location'] + tail
+    if not evicted:
+        return
+
+    archive_path = _live_archive_path()
+    if archive_path:
+        try:
+            os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+            with open(archive_path, 'ab') as f:
+                for item in evicted:
+                    f.write(orjson.dumps(item) + b'\n')
+        except OSError as e:
+            print(f"[ERROR] Failed to archive live points: {str(e)}")
+            return  # keep everything in memory rather than lose data
+
+    first_keep = next((i for i in tail if i.get('_type') == 'location'), None)
+    boundary = [first_keep] if first_keep else []
+    _live_cache['archived_distance'] = (_live_cache.get('archived_distance', 0.0)
+                                        + calculate_track_distance(evicted + boundary))
+    _live_cache.setdefault('first_fix_tst', evicted[0]['tst'])
+    _live_cache['raw_data'] = keep
+    _live_cache['raw_tsts'] = set(item.get('tst') for item in keep)
+    # Force a full distance recompute over the shortened list next time
+    _live_cache['dist_n'] = 0
+
+
+def _read_live_archive():
+    """Points previously pruned to disk, oldest first ([] if none)."""
+    archive_path = _live_archive_path()
+    if not archive_path or not os.path.exists(archive_path):
+        return []
+    try:
+        with open(archive_path, 'rb') as f:
+            return [orjson.loads(line) for line in f if line.strip()]
+    except (OSError, orjson.JSONDecodeError) as e:
+        print(f"[ERROR] Failed to read live archive: {str(e)}")
+        return []
+
+
+# Last (start_timestamp, timezone) actually written to disk. live_poll runs
+# every 30 seconds; persisting only on real transitions (fresh start, tz
+# detection) keeps the steady-state tick free of disk writes.
+_persisted_live_state = None
+
+
+def _maybe_save_live_state(start_timestamp, tz_name):
+    global _persisted_live_state
+    if _persisted_live_state == (start_timestamp, tz_name):
+        return
+    save_live_state(start_timestamp, tz_name)
+    _persisted_live_state = (start_timestamp, tz_name)
+
+
 @app.route("/api/live/start", methods=["POST"])
 def live_start():
     """Initialize or resume live mode.
@@ -735,8 +1000,8 @@ def live_start():
     # Check if session is already active in memory (another device joined)
     elif _live_cache.get('is_active') and _live_cache.get('start_timestamp'):
         # Return existing session for joining device
-        detected_tz = _live_cache.get('detected_tz') or pytz.timezone(config.DEFAULT_TIMEZONE)
-        start_dt = datetime.fromtimestamp(_live_cache['start_timestamp'], tz=pytz.UTC).astimezone(detected_tz)
+        detected_tz = _live_cache.get('detected_tz') or tz_from_name(config.DEFAULT_TIMEZONE)
+        start_dt = datetime.fromtimestamp(_live_cache['start_timestamp'], tz=detected_tz)
 
         # Format stats for response
         stats_response = _format_activity_stats(_live_cache.get('activity_stats', {}))
@@ -746,7 +1011,7 @@ def live_start():
             "mode": "joined",
             "start_timestamp": _live_cache['start_timestamp'],
             "start_time_str": start_dt.strftime('%Y-%m-%d %H:%M:%S'),
-            "timezone": detected_tz.zone,
+            "timezone": str(detected_tz),
             "total_points": len(_live_cache.get('gps_points', [])),
             "stats": stats_response
         })
@@ -758,11 +1023,11 @@ def live_start():
         # Resume from saved state - fetch all data from start to now
         start_timestamp = saved_state['start_timestamp']
         tz_name = saved_state.get('timezone', config.DEFAULT_TIMEZONE)
-        detected_tz = pytz.timezone(tz_name)
+        detected_tz = tz_from_name(tz_name)
 
         # Fetch all data from start_timestamp to now
-        from_dt = datetime.fromtimestamp(start_timestamp, tz=pytz.UTC).astimezone(detected_tz)
-        to_dt = datetime.fromtimestamp(now, tz=pytz.UTC).astimezone(detected_tz)
+        from_dt = datetime.fromtimestamp(start_timestamp, tz=detected_tz)
+        to_dt = datetime.fromtimestamp(now, tz=detected_tz)
 
         raw_data = fetch_owntracks_data(
             from_dt.strftime('%Y-%m-%d'),
@@ -782,7 +1047,7 @@ def live_start():
             first_gps = next((item for item in raw_data if item.get("_type") == "location"), None)
             if first_gps:
                 detected_tz = get_timezone_from_gps(first_gps['lat'], first_gps['lon'])
-                tz_name = detected_tz.zone
+                tz_name = str(detected_tz)
 
             gps_points, activities = parse_activities(raw_data)
             activity_stats = calculate_activity_stats(activities) if activities else {}
@@ -801,10 +1066,13 @@ def live_start():
             'gps_points': gps_points,
             'activities': activities,
             'activity_stats': activity_stats,
-            'raw_data': raw_data
+            'raw_data': raw_data,
+            'raw_tsts': set(item.get('tst') for item in raw_data),
+            'idle_polls': 0,
+            'parse_gen': 0
         }
 
-        start_dt = datetime.fromtimestamp(start_timestamp, tz=pytz.UTC).astimezone(detected_tz)
+        start_dt = datetime.fromtimestamp(start_timestamp, tz=detected_tz)
         stats_response = _format_activity_stats(activity_stats)
 
         return jsonify({
@@ -818,8 +1086,8 @@ def live_start():
         })
 
     # Fresh start
-    default_tz = pytz.timezone(config.DEFAULT_TIMEZONE)
-    tz_name = default_tz.zone
+    default_tz = tz_from_name(config.DEFAULT_TIMEZONE)
+    tz_name = str(default_tz)
 
     # Initialize live cache
     _live_cache = {
@@ -830,13 +1098,16 @@ def live_start():
         'gps_points': [],
         'activities': {},
         'activity_stats': {},
-        'raw_data': []
+        'raw_data': [],
+        'raw_tsts': set(),
+        'idle_polls': 0,
+        'parse_gen': 0
     }
 
     # Persist state for restart recovery
-    save_live_state(now, tz_name)
+    _maybe_save_live_state(now, tz_name)
 
-    start_dt = datetime.fromtimestamp(now, tz=pytz.UTC).astimezone(default_tz)
+    start_dt = datetime.fromtimestamp(now, tz=default_tz)
 
     return jsonify({
         "success": True,
@@ -849,8 +1120,21 @@ def live_start():
     })
 
 
+# Last formatted stats response, keyed by a cheap content fingerprint.
+# Live polling reformats the same unchanged stats every 30s otherwise.
+_stats_format_cache = (None, None)
+
+
 def _format_activity_stats(activity_stats):
     """Format activity stats for JSON response."""
+    global _stats_format_cache
+    fingerprint = tuple(
+        (t, s['count'], s['total_distance'], s['total_duration'], s['total_points'])
+        for t, s in sorted(activity_stats.items())
+    )
+    if fingerprint == _stats_format_cache[0]:
+        return _stats_format_cache[1]
+
     stats_response = {}
     for activity_type in ['car', 'bike', 'other']:
         if activity_type in activity_stats:
@@ -863,6 +1147,7 @@ def _format_activity_stats(activity_stats):
                 'total_points': s['total_points'],
                 'avg_speed': round((s['total_distance'] / s['total_duration'] * 3600), 1) if s['total_duration'] > 0 else 0
             }
+    _stats_format_cache = (fingerprint, stats_response)
     return stats_response
 
 
@@ -885,11 +1170,13 @@ def live_poll():
                 'is_active': True,
                 'start_timestamp': saved_state['start_timestamp'],
                 'last_poll_timestamp': saved_state['start_timestamp'],  # Will refetch all data
-                'detected_tz': pytz.timezone(tz_name),
+                'detected_tz': tz_from_name(tz_name),
                 'gps_points': [],
                 'activities': {},
                 'activity_stats': {},
-                'raw_data': []
+                'raw_data': [],
+                'raw_tsts': set(),
+                'idle_polls': 0
             }
         else:
             return jsonify({"success": False, "error": "Live mode not active"}), 400
@@ -904,37 +1191,55 @@ def live_poll():
 
     # Convert timestamps to date/time strings for OwnTracks API
     # Fetch from 1 second after last poll to now
-    from_dt = datetime.fromtimestamp(last_poll, tz=pytz.UTC).astimezone(detected_tz)
-    to_dt = datetime.fromtimestamp(now, tz=pytz.UTC).astimezone(detected_tz)
-
-    # Fetch new data
-    new_data, tracking_service_status = fetch_owntracks_data(
-        from_dt.strftime('%Y-%m-%d'),
-        to_dt.strftime('%Y-%m-%d'),
-        from_dt.strftime('%H:%M:%S'),
-        to_dt.strftime('%H:%M:%S'),
-        server_ip=config.OWNTRACKS_SERVER_IP,
-        server_port=config.OWNTRACKS_SERVER_PORT,
-        user=config.OWNTRACKS_USER,
-        device_id=config.OWNTRACKS_DEVICE_ID,
-        target_timezone=detected_tz,
-        default_timezone=config.DEFAULT_TIMEZONE,
-        return_status=True
-    )
+    from_dt = datetime.fromtimestamp(last_poll, tz=detected_tz)
+    to_dt = datetime.fromtimestamp(now, tz=detected_tz)
+
+    # Coalesce polls from joined devices: the first caller in a window does
+    # the upstream fetch and merges into the shared cache; anyone arriving
+    # while it is in flight blocks on the lock, then finds a fresh
+    # last_fetch_walltime and serves straight from the merged cache instead
+    # of re-asking OwnTracks for the same overlapping range. Safe because
+    # gunicorn runs a single worker process (threads only).
+    coalesced = False
+    with _live_fetch_lock:
+        if time.time() - _live_cache.get('last_fetch_walltime', 0) < LIVE_FETCH_COALESCE_S:
+            coalesced = True
+            new_data = None
+            tracking_service_status = _live_cache.get('last_fetch_status', 'available')
+        else:
+            new_data, tracking_service_status = fetch_owntracks_data(
+                from_dt.strftime('%Y-%m-%d'),
+                to_dt.strftime('%Y-%m-%d'),
+                from_dt.strftime('%H:%M:%S'),
+                to_dt.strftime('%H:%M:%S'),
+                server_ip=config.OWNTRACKS_SERVER_IP,
+                server_port=config.OWNTRACKS_SERVER_PORT,
+                user=config.OWNTRACKS_USER,
+                device_id=config.OWNTRACKS_DEVICE_ID,
+                target_timezone=detected_tz,
+                default_timezone=config.DEFAULT_TIMEZONE,
+                return_status=True
+            )
+            _live_cache['last_fetch_walltime'] = time.time()
+            _live_cache['last_fetch_status'] = tracking_service_status
 
     new_points = []
+    merged_new_items = False
     if new_data:
         # Filter to only points after last_poll timestamp
         for item in new_data:
             if item.get('_type') == 'location' and item.get('tst', 0) > last_poll:
                 new_points.append(item)
 
-        # Merge new raw data (avoiding duplicates based on timestamp)
-        existing_timestamps = set(item.get('tst') for item in _live_cache['raw_data'])
+        # Merge new raw data (avoiding duplicates based on timestamp).
+        # raw_tsts is maintained across polls so dedup is O(new items)
+        # instead of rebuilding a set over the whole session every tick.
+        raw_tsts = _live_cache['raw_tsts']
         for item in new_data:
-            if item.get('tst') not in existing_timestamps:
+            if item.get('tst') not in raw_tsts:
                 _live_cache['raw_data'].append(item)
-                existing_timestamps.add(item.get('tst'))
+                raw_tsts.add(item.get('tst'))
+                merged_new_items = True
 
     # Update timezone from first GPS point if we haven't yet
     if _live_cache['gps_points'] == [] and new_points:
@@ -942,16 +1247,29 @@ def live_poll():
         detected_tz = get_timezone_from_gps(first_point['lat'], first_point['lon'])
         _live_cache['detected_tz'] = detected_tz
         # Update persisted state with detected timezone
-        save_live_state(_live_cache['start_timestamp'], detected_tz.zone)
-
-    # Re-parse all activities from full raw data
-    _live_cache['raw_data'].sort(key=lambda x: x.get('tst', 0))
-    gps_points, activities = parse_activities(_live_cache['raw_data'])
-    activity_stats = calculate_activity_stats(activities) if activities else {}
-
-    _live_cache['gps_points'] = gps_points
-    _live_cache['activities'] = activities
-    _live_cache['activity_stats'] = activity_stats
+        _maybe_save_live_state(_live_cache['start_timestamp'], str(detected_tz))
+
+    # Re-parse activities only when the raw data actually changed. Ride
+    # segmentation is a whole-session computation (a late marker can reshape
+    # earlier rides), so parsing stays global - but idle polls, the common
+    # case on a 30s cadence, now skip the O(N) sort/parse/stats entirely.
+    if merged_new_items:
+        _live_cache['raw_data'].sort(key=lambda x: x.get('tst', 0))
+        _prune_live_raw()
+        gps_points, activities = parse_activities(_live_cache['raw_data'])
+        activity_stats = calculate_activity_stats(activities) if activities else {}
+
+        _live_cache['gps_points'] = gps_points
+        _live_cache['activities'] = activities
+        _live_cache['activity_stats'] = activity_stats
+        # Every re-parse gets a new generation number; the live-track ETag
+        # includes it so marker-only merges (which reshape rides without
+        # adding points or moving the watermark) still invalidate clients
+        _live_cache['parse_gen'] = _live_cache.get('parse_gen', 0) + 1
+    else:
+        gps_points = _live_cache['gps_points']
+        activities = _live_cache['activities']
+        activity_stats = _live_cache['activity_stats']
 
     # Only advance last_poll_timestamp if we received new points.
     # Set it to the last point's timestamp, not 'now', so late-arriving
@@ -959,33 +1277,52 @@ def live_poll():
     if new_points:
         last_point_tst = max(p.get('tst', 0) for p in new_points)
         _live_cache['last_poll_timestamp'] = last_point_tst
+        _live_cache['idle_polls'] = 0
+    elif not coalesced:
+        # Coalesced polls reuse another device's fetch; they say nothing
+        # about whether the phone is idle, so they don't advance the backoff.
+        _live_cache['idle_polls'] = _live_cache.get('idle_polls', 0) + 1
+
+    # Fast path for the common idle tick: nothing merged and the client
+    # has drawn everything it knows about, so skip the payload rebuild and
+    # answer with a heartbeat-sized response the frontend treats as
+    # "keep the current render". Gated on merged_new_items, not just
+    # new_points: a marker-only merge re-parses and changes the stats even
+    # though no drawable point arrived, and the client must see that.
+    if (not new_points and not merged_new_items and gps_points
+            and last_drawn_timestamp >= gps_points[-1]['tst']):
+        return jsonify({
+            "success": True,
+            "unchanged": True,
+            "new_points_count": 0,
+            "total_points": len(gps_points),
+            "tracking_service_status": tracking_service_status,
+            "last_poll_timestamp": now,
+            "next_poll_interval_ms": _next_poll_interval_ms(_live_cache['idle_polls'])
+        })
 
     # Format stats for response
     stats_response = _format_activity_stats(activity_stats)
 
     # Format new points for frontend (legacy, kept for debugging)
-    new_points_response = [
-        {"lat": p["lat"], "lng": p["lon"], "tst": p["tst"]}
-        for p in new_points
-    ]
+    new_points_response = _points_soa(new_points)
 
     # Get all points to draw (points after last_drawn_timestamp)
     # This ensures no points are missed due to timing issues
-    points_to_draw = [
-        {"lat": p["lat"], "lng": p["lon"], "tst": p["tst"]}
-        for p in gps_points
-        if p["tst"] > last_drawn_timestamp
-    ]
+    to_draw = [p for p in gps_points if p["tst"] > last_drawn_timestamp]
+    points_to_draw = _points_soa(to_draw)
 
     # Calculate total distance and duration for tracking display
-    total_distance = calculate_track_distance(gps_points)
+    total_distance = _live_total_distance(gps_points)
     total_duration = 0
     last_point_time = None
     if len(gps_points) > 1:
-        total_duration = gps_points[-1]["tst"] - gps_points[0]["tst"]
+        # Anchor at the true session start even if old fixes were archived
+        first_tst = _live_cache.get('first_fix_tst') or gps_points[0]["tst"]
+        total_duration = gps_points[-1]["tst"] - first_tst
         # Format last point time
         last_tst = gps_points[-1]["tst"]
-        last_dt = datetime.fromtimestamp(last_tst, tz=pytz.UTC).astimezone(detected_tz)
+        last_dt = datetime.fromtimestamp(last_tst, tz=detected_tz)
         last_point_time = last_dt.strftime('%H:%M:%S')
 
     return jsonify({
@@ -993,14 +1330,15 @@ def live_poll():
         "new_points": new_points_response,
         "new_points_count": len(new_points),
         "points_to_draw": points_to_draw,
-        "points_to_draw_count": len(points_to_draw),
+        "points_to_draw_count": len(to_draw),
         "total_points": len(gps_points),
         "total_distance": round(total_distance, 2),
         "total_duration": total_duration,
         "last_point_time": last_point_time,
         "stats": stats_response,
         "tracking_service_status": tracking_service_status,
-        "last_poll_timestamp": now
+        "last_poll_timestamp": now,
+        "next_poll_interval_ms": _next_poll_interval_ms(_live_cache['idle_polls'])
     })
 
 
@@ -1013,79 +1351,97 @@ def get_live_track_data(activity_type):
     activities = _live_cache.get('activities', {})
     gps_points = _live_cache.get('gps_points', [])
     activity_stats = _live_cache.get('activity_stats', {})
-    detected_tz = _live_cache.get('detected_tz') or pytz.timezone(config.DEFAULT_TIMEZONE)
-
-    ride_colors = {
-        'car': ['#FF0000', '#FF8C00', '#FFD700', '#FF1493', '#8B0000'],
-        'bike': ['#FF8C00', '#228B22', '#1E90FF', '#8B4513', '#4B0082', '#DC143C', '#00CED1'],
-        'other': ['#800080', '#FF00FF', '#FFA500', '#00FFFF', '#8B4513']
-    }
+    detected_tz = _live_cache.get('detected_tz') or tz_from_name(config.DEFAULT_TIMEZONE)
+
+    # The cached data only changes when a poll re-parses, so the (last
+    # poll, parse generation, point count) triple works as an ETag:
+    # unchanged layers get an empty 304 instead of a full rebuild and
+    # re-download. The generation covers marker-only merges, where rides
+    # reshape without new points advancing the poll watermark.
+    etag = (f'"live-{activity_type}-{_live_cache.get("last_poll_timestamp")}-'
+            f'{_live_cache.get("parse_gen", 0)}-{len(gps_points)}"')
+    if request.headers.get('If-None-Match') == etag:
+        return Response(status=304)
 
     if activity_type == 'all':
         if not gps_points:
             return jsonify({"success": False, "error": "No GPS points available"}), 404
 
-        layer_distance = calculate_track_distance(gps_points)
+        layer_distance = _live_total_distance(gps_points)
         layer_duration = gps_points[-1]["tst"] - gps_points[0]["tst"] if len(gps_points) > 1 else 0
 
-        start_local = datetime.fromtimestamp(gps_points[0]['tst'], tz=pytz.UTC).astimezone(detected_tz)
-        end_local = datetime.fromtimestamp(gps_points[-1]['tst'], tz=pytz.UTC).astimezone(detected_tz)
-
-        return jsonify({
+        response = jsonify({
             "success": True,
             "activity_type": "all",
             "mode": "basic",
-            "points": [{"lat": p["lat"], "lng": p["lon"], "tst": p["tst"]} for p in gps_points],
+            "points": _points_payload(gps_points),
             "stats": {
                 "distance": round(layer_distance, 2),
                 "duration": layer_duration,
                 "rides": sum(activity_stats.get(a, {}).get('count', 0) for a in ['car', 'bike', 'other']),
                 "points": len(gps_points)
             },
-            "start_time_str": start_local.strftime('%H:%M:%S'),
-            "end_time_str": end_local.strftime('%H:%M:%S'),
-            "tz_name": detected_tz.zone
+            "start_time_str": format_local_time(gps_points[0]['tst'], detected_tz, '%H:%M:%S'),
+            "end_time_str": format_local_time(gps_points[-1]['tst'], detected_tz, '%H:%M:%S'),
+            "tz_name": str(detected_tz)
         })
+        response.headers['ETag'] = etag
+        return response
 
     if activity_type not in activities or not activities[activity_type]:
         return jsonify({"success": False, "error": f"No {activity_type} activities found"}), 404
 
-    colors = ride_colors.get(activity_type, ['#FFA500'])
+    colors = RIDE_COLORS.get(activity_type, ['#FFA500'])
     rides_data = []
 
+    # Per-ride payloads are cached across polls: in a live session only the
+    # ride in progress changes between requests, so finished rides (stable
+    # start/end/point-count) reuse their serialized dict instead of redoing
+    # the O(points) formatting pass. The per-type cache is rebuilt each
+    # request from the keys actually seen, so stale entries don't pile up.
+    payload_cache = _live_cache.setdefault('ride_payload_cache', {})
+    type_cache = payload_cache.get(activity_type, {})
+    fresh_type_cache = {}
+
     for ride_idx, ride in enumerate(activities[activity_type]):
         if not ride['points']:
             continue
 
-        color = colors[ride_idx % len(colors)]
-        start_timestamp, end_timestamp = ride_stat_window(ride)
-
-        start_local = datetime.fromtimestamp(start_timestamp, tz=pytz.UTC).astimezone(detected_tz)
-        end_local = datetime.fromtimestamp(end_timestamp, tz=pytz.UTC).astimezone(detected_tz)
+        # Per-ride aggregates are cached by calculate_activity_stats
+        start_timestamp = ride['stat_start']
+        end_timestamp = ride['stat_end']
+        cache_key = (ride_idx, start_timestamp, end_timestamp,
+                     len(ride['points']), str(detected_tz))
+
+        ride_payload = type_cache.get(cache_key)
+        if ride_payload is None:
+            ride_distance = ride['distance']
+            ride_duration = ride['duration']
+            avg_speed = (ride_distance / ride_duration * 3600) if ride_duration > 0 else 0
+
+            ride_payload = {
+                'ride_number': ride_idx + 1,
+                'start_timestamp': start_timestamp,
+                'end_timestamp': end_timestamp,
+                'start_time_str': format_local_time(start_timestamp, detected_tz, '%H:%M:%S'),
+                'end_time_str': format_local_time(end_timestamp, detected_tz, '%H:%M:%S'),
+                'start_datetime_str': format_local_time(start_timestamp, detected_tz, '%b %d, %H:%M:%S'),
+                'end_datetime_str': format_local_time(end_timestamp, detected_tz, '%b %d, %H:%M:%S'),
+                'points': _points_payload(ride['points']),
+                'distance': round(ride_distance, 2),
+                'duration': ride_duration,
+                'avg_speed': round(avg_speed, 1),
+                'color': colors[ride_idx % len(colors)]
+            }
 
-        ride_distance = calculate_track_distance(ride['points'])
+        fresh_type_cache[cache_key] = ride_payload
+        rides_data.append(ride_payload)
 
-        ride_duration = end_timestamp - start_timestamp
-        avg_speed = (ride_distance / ride_duration * 3600) if ride_duration > 0 else 0
-
-        rides_data.append({
-            'ride_number': ride_idx + 1,
-            'start_timestamp': start_timestamp,
-            'end_timestamp': end_timestamp,
-            'start_time_str': start_local.strftime('%H:%M:%S'),
-            'end_time_str': end_local.strftime('%H:%M:%S'),
-            'start_datetime_str': start_local.strftime('%b %d, %H:%M:%S'),
-            'end_datetime_str': end_local.strftime('%b %d, %H:%M:%S'),
-            'points': [{"lat": p["lat"], "lng": p["lon"], "tst": p["tst"]} for p in ride['points']],
-            'distance': round(ride_distance, 2),
-            'duration': ride_duration,
-            'avg_speed': round(avg_speed, 1),
-            'color': color
-        })
+    payload_cache[activity_type] = fresh_type_cache
 
     stats = activity_stats.get(activity_type, {})
 
-    return jsonify({
+    response = jsonify({
         "success": True,
         "activity_type": activity_type,
         "mode": "rich",
@@ -1096,8 +1452,10 @@ def get_live_track_data(activity_type):
             "rides": stats.get('count', 0),
             "points": stats.get('total_points', 0)
         },
-        "tz_name": detected_tz.zone
+        "tz_name": str(detected_tz)
     })
+    response.headers['ETag'] = etag
+    return response
 
 
 @app.route("/api/live/stop", methods=["POST"])
@@ -1117,7 +1475,7 @@ def live_save_map():
     gps_points = _live_cache['gps_points']
     activities = _live_cache.get('activities', {})
     activity_stats = _live_cache.get('activity_stats', {})
-    detected_tz = _live_cache.get('detected_tz') or pytz.timezone(config.DEFAULT_TIMEZONE)
+    detected_tz = _live_cache.get('detected_tz') or tz_from_name(config.DEFAULT_TIMEZONE)
     start_timestamp = _live_cache.get('start_timestamp')
 
     # Determine which layers have data
@@ -1135,20 +1493,17 @@ def live_save_map():
     saved_layers_data = {}
     saved_rides_data = {}
 
-    ride_colors = {
-        'car': ['#FF0000', '#FF8C00', '#FFD700', '#FF1493', '#8B0000'],
-        'bike': ['#FF8C00', '#228B22', '#1E90FF', '#8B4513', '#4B0082', '#DC143C', '#00CED1'],
-        'other': ['#800080', '#FF00FF', '#FFA500', '#00FFFF', '#8B4513']
-    }
+    # Fixes pruned to the disk archive still belong on the saved map
+    archived_points = _read_live_archive()
 
     for layer_type in active_layers:
         if layer_type == 'all':
-            points = gps_points
+            points = archived_points + gps_points if archived_points else gps_points
         elif layer_type in activities:
             points = []
             for ride in activities[layer_type]:
                 points.extend(ride['points'])
-            points.sort(key=lambda x: x['tst'])
+            points.sort(key=itemgetter('tst'))
         else:
             continue
 
@@ -1161,49 +1516,49 @@ def live_save_map():
             layer_duration = stats.get('total_duration', 0)
             layer_rides = stats.get('count', 0)
         else:
-            layer_distance = calculate_track_distance(points)
+            # Only the 'all' layer lands here, so reuse the running total
+            # maintained by the poll path instead of a fresh O(N) pass
+            layer_distance = _live_total_distance(gps_points)
             layer_duration = points[-1]["tst"] - points[0]["tst"] if len(points) > 1 else 0
             layer_rides = sum(activity_stats.get(a, {}).get('count', 0) for a in ['car', 'bike', 'other'])
 
-        start_local = datetime.fromtimestamp(points[0]['tst'], tz=pytz.UTC).astimezone(detected_tz)
-        end_local = datetime.fromtimestamp(points[-1]['tst'], tz=pytz.UTC).astimezone(detected_tz)
-
         saved_layers_data[layer_type] = {
-            'points': [{'lat': p['lat'], 'lng': p['lon'], 'tst': p['tst']} for p in points],
+            'points': _points_payload(points),
             'stats': {
                 'distance': layer_distance,
                 'duration': layer_duration,
                 'rides': layer_rides,
                 'points': len(points),
-                'start_time_str': start_local.strftime('%H:%M:%S'),
-                'end_time_str': end_local.strftime('%H:%M:%S')
+                'start_time_str': format_local_time(points[0]['tst'], detected_tz, '%H:%M:%S'),
+                'end_time_str': format_local_time(points[-1]['tst'], detected_tz, '%H:%M:%S')
             }
         }
 
         if layer_type in ['car', 'bike', 'other'] and layer_type in activities:
-            colors = ride_colors.get(layer_type, ['#FFA500'])
+            colors = RIDE_COLORS.get(layer_type, ['#FFA500'])
             saved_rides_data[layer_type] = []
             for ride_idx, ride in enumerate(activities[layer_type]):
                 if not ride['points']:
                     continue
-                stat_start, stat_end = ride_stat_window(ride)
-                s_local = datetime.fromtimestamp(stat_start, tz=pytz.UTC).astimezone(detected_tz)
-                e_local = datetime.fromtimestamp(stat_end, tz=pytz.UTC).astimezone(detected_tz)
+                stat_start, stat_end = ride['stat_start'], ride['stat_end']
                 saved_rides_data[layer_type].append({
                     'start': stat_start,
                     'end': stat_end,
-                    'points': [{'lat': p['lat'], 'lng': p['lon'], 'tst': p['tst']} for p in ride['points']],
-                    'start_time_str': s_local.strftime('%b %d, %H:%M:%S'),
-                    'end_time_str': e_local.strftime('%b %d, %H:%M:%S'),
+                    'distance': ride['distance'],
+                    'points': _points_payload(ride['points']),
+                    'start_time_str': format_local_time(stat_start, detected_tz, '%b %d, %H:%M:%S'),
+                    'end_time_str': format_local_time(stat_end, detected_tz, '%b %d, %H:%M:%S'),
                     'color': colors[ride_idx % len(colors)]
                 })
 
-    # Generate filename with date range
-    now = datetime.now()
+    # Generate filename with date range. One tz-aware snapshot of "now":
+    # the session started in detected_tz, so the end date and saved-at
+    # strings must come from the same zone (the container clock runs UTC).
+    now = datetime.now(tz=detected_tz)
     if start_timestamp:
-        start_dt = datetime.fromtimestamp(start_timestamp, tz=pytz.UTC).astimezone(detected_tz)
+        start_dt = datetime.fromtimestamp(start_timestamp, tz=detected_tz)
     else:
-        start_dt = datetime.fromtimestamp(gps_points[0]['tst'], tz=pytz.UTC).astimezone(detected_tz)
+        start_dt = datetime.fromtimestamp(gps_points[0]['tst'], tz=detected_tz)
     end_dt = now
 
     start_date_str = start_dt.strftime("%Y-%m-%d")
@@ -1220,23 +1575,15 @@ def live_save_map():
     # Generate date range string for display
     date_range_display = f"{start_dt.strftime('%Y-%m-%d %H:%M')} to {end_dt.strftime('%Y-%m-%d %H:%M')}"
 
-    # Generate self-contained HTML
-    html = _generate_saved_map_html(
-        saved_layers_data, saved_rides_data,
+    # Generate and write the self-contained HTML off the request thread
+    saved_path = _start_saved_map_write(
+        filename, saved_layers_data, saved_rides_data,
         date_range=date_range_display,
         active_layers=active_layers,
         total_points=len(gps_points),
         saved_timestamp=now.strftime("%Y-%m-%d %H:%M:%S")
     )
 
-    # Save to saved_maps directory
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    saved_maps_dir = os.path.join(script_dir, "saved_maps")
-    os.makedirs(saved_maps_dir, exist_ok=True)
-    saved_path = os.path.join(saved_maps_dir, filename)
-    with open(saved_path, 'w', encoding='utf-8', newline='') as f:
-        f.write(html)
-
     return jsonify({
         "success": True,
         "filename": filename,
@@ -1275,8 +1622,8 @@ def live_status():
     is_stale = age_days > STALE_THRESHOLD_DAYS
 
     # Format start time for display
-    tz = pytz.timezone(tz_name)
-    start_dt = datetime.fromtimestamp(start_timestamp, tz=pytz.UTC).astimezone(tz)
+    tz = tz_from_name(tz_name)
+    start_dt = datetime.fromtimestamp(start_timestamp, tz=tz)
 
     # Check if session is currently active in memory
     is_active = _live_cache.get('is_active', False)
@@ -1309,7 +1656,7 @@ def _build_timeline(gps_points, activities, lwt_markers, detected_tz):
                     'type': activity_type
                 })
 
-    all_activities.sort(key=lambda x: x['start'])
+    all_activities.sort(key=itemgetter('start'))
 
     if 'other' in activities and activities['other']:
         first_gps_time = min(p['tst'] for p in gps_points) if gps_points else 0
@@ -1360,13 +1707,13 @@ def _build_timeline(gps_points, activities, lwt_markers, detected_tz):
                 'type': 'real'
             })
 
-    timeline.sort(key=lambda x: x['timestamp'])
+    timeline.sort(key=itemgetter('timestamp'))
 
-    # Format timestamps for display
+    # Format timestamps for display. Paired start/end events share their
+    # timestamps, so the memoized formatter does each conversion once.
     for event in timeline:
-        ts_utc = datetime.fromtimestamp(event['timestamp'], tz=pytz.UTC)
-        ts_local = ts_utc.astimezone(detected_tz)
-        event['time'] = ts_local.strftime("%Y-%m-%d %H:%M:%S %Z")
+        event['time'] = format_local_time(event['timestamp'], detected_tz,
+                                          "%Y-%m-%d %H:%M:%S %Z")
 
     return timeline
 
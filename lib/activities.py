@@ -1,9 +1,13 @@
+from bisect import bisect_right
+from operator import itemgetter
+
 from lib.geo import (
     haversine,
     haversine_with_stationary_detection,
     calculate_track_distance,
     find_movement_boundaries,
     detect_stationary_gap,
+    summarize_ride,
 )
 
 
@@ -17,8 +21,8 @@ def parse_activities(raw_data):
         elif item.get("_type") == "lwt" and item.get("custom") is True:
             lwt_markers.append(item)
 
-    gps_points.sort(key=lambda x: x["tst"])
-    lwt_markers.sort(key=lambda x: x["tst"])
+    gps_points.sort(key=itemgetter("tst"))
+    lwt_markers.sort(key=itemgetter("tst"))
 
     activities = {
         'car': [],
@@ -34,30 +38,22 @@ def parse_activities(raw_data):
 
     active_activities = {}
 
+    # One table-driven block handles every <type>_start/<type>_end marker
+    # pair instead of duplicated if/elif chains per activity type
     for marker in lwt_markers:
-        activity_type = marker.get("activity", "")
+        ride_type, _, kind = marker.get("activity", "").rpartition("_")
+        if ride_type not in ('car', 'bike'):
+            continue
         timestamp = marker["tst"]
 
-        if activity_type == "car_start":
-            active_activities['car'] = timestamp
-        elif activity_type == "car_end":
-            if 'car' in active_activities:
-                start_time = active_activities.pop('car')
-            else:
-                start_time = gps_points[0]["tst"] if gps_points else timestamp
-            activities['car'].append({
-                'start': start_time,
-                'end': timestamp,
-                'points': []
-            })
-        elif activity_type == "bike_start":
-            active_activities['bike'] = timestamp
-        elif activity_type == "bike_end":
-            if 'bike' in active_activities:
-                start_time = active_activities.pop('bike')
+        if kind == "start":
+            active_activities[ride_type] = timestamp
+        elif kind == "end":
+            if ride_type in active_activities:
+                start_time = active_activities.pop(ride_type)
             else:
                 start_time = gps_points[0]["tst"] if gps_points else timestamp
-            activities['bike'].append({
+            activities[ride_type].append({
                 'start': start_time,
                 'end': timestamp,
                 'points': []
@@ -72,18 +68,31 @@ def parse_activities(raw_data):
                 'points': []
             })
 
+    # Assign points to rides by bisecting a flat start-sorted interval list
+    # instead of scanning every car/bike ride per point. The prefix-max of
+    # interval ends lets the backward walk stop immediately for the normal
+    # non-overlapping case while still finding an enclosing ride if marker
+    # windows ever nest.
+    intervals = sorted(activities['car'] + activities['bike'],
+                       key=itemgetter('start'))
+    starts = [r['start'] for r in intervals]
+    max_end = 0
+    max_end_prefix = []
+    for ride in intervals:
+        max_end = max(max_end, ride['end'])
+        max_end_prefix.append(max_end)
+
     for point in gps_points:
         point_time = point["tst"]
         assigned = False
 
-        for activity_type in ['car', 'bike']:
-            for activity in activities[activity_type]:
-                if activity['start'] <= point_time <= activity['end']:
-                    activity['points'].append(point)
-                    assigned = True
-                    break
-            if assigned:
+        i = bisect_right(starts, point_time) - 1
+        while i >= 0 and max_end_prefix[i] >= point_time:
+            if intervals[i]['end'] >= point_time:
+                intervals[i]['points'].append(point)
+                assigned = True
                 break
+            i -= 1
 
         if not assigned:
             activities['other'].append(point)
@@ -110,6 +119,8 @@ def parse_activities(raw_data):
         filtered_rides['other'] = 0
 
     activities['_filtered_rides'] = filtered_rides
+    # Already collected and sorted above; saves callers a raw_data re-scan
+    activities['_lwt_markers'] = lwt_markers
     return gps_points, activities
 
 
@@ -117,7 +128,8 @@ def process_other_ride(ride_points, min_duration_seconds):
     if not ride_points:
         return None
 
-    start_idx, end_idx = find_movement_boundaries(ride_points)
+    # One fused pass gives the boundaries and the distance together
+    start_idx, end_idx, ride_distance = summarize_ride(ride_points)
 
     if start_idx is not None and end_idx is not None:
         movement_start_time = ride_points[start_idx]['tst']
@@ -125,23 +137,25 @@ def process_other_ride(ride_points, min_duration_seconds):
         movement_duration = movement_end_time - movement_start_time
 
         if movement_duration >= min_duration_seconds:
-            ride_distance = calculate_track_distance(ride_points)
             if ride_distance >= 0.1:
+                # ride_points is a private list rebuilt per ride by the
+                # caller and never mutated afterwards, so no defensive copy
                 return {
                     'start': movement_start_time,
                     'end': movement_end_time,
-                    'points': ride_points.copy()
+                    'points': ride_points,
+                    'distance': ride_distance
                 }
         return None
     else:
         fallback_duration = ride_points[-1]['tst'] - ride_points[0]['tst']
         if fallback_duration >= min_duration_seconds:
-            ride_distance = calculate_track_distance(ride_points)
             if ride_distance >= 0.1:
                 return {
                     'start': ride_points[0]['tst'],
                     'end': ride_points[-1]['tst'],
-                    'points': ride_points.copy()
+                    'points': ride_points,
+                    'distance': ride_distance
                 }
         return None
 
@@ -151,8 +165,8 @@ def create_other_activity_rides(other_points, car_bike_activities):
         return [], 0
 
     try:
-        all_activities = sorted(car_bike_activities, key=lambda x: x['start'])
-        other_points.sort(key=lambda x: x['tst'])
+        all_activities = sorted(car_bike_activities, key=itemgetter('start'))
+        other_points.sort(key=itemgetter('tst'))
 
         other_rides = []
         current_ride_points = []
@@ -161,6 +175,12 @@ def create_other_activity_rides(other_points, car_bike_activities):
         MIN_RIDE_DURATION = 5 * 60
         STATIONARY_THRESHOLD = 10
 
+        # Timestamp of the trailing point of the ride's last moving segment.
+        # Maintained as points are appended so the stationary-tail duration
+        # is one subtraction instead of detect_stationary_gap re-scanning
+        # the whole ride for every new point (O(N^2) per day).
+        last_move_end_tst = None
+
         for point in other_points:
             point_time = point['tst']
             should_start_new_ride = False
@@ -177,9 +197,8 @@ def create_other_activity_rides(other_points, car_bike_activities):
                     time_gap = point_time - last_point_time
                     if time_gap > GAP_THRESHOLD_SECONDS:
                         should_start_new_ride = True
-                    elif not should_start_new_ride:
-                        stationary_duration = detect_stationary_gap(
-                            current_ride_points, GAP_THRESHOLD_SECONDS, STATIONARY_THRESHOLD)
+                    else:
+                        stationary_duration = last_point_time - last_move_end_tst
                         if stationary_duration > GAP_THRESHOLD_SECONDS:
                             should_start_new_ride = True
 
@@ -189,6 +208,15 @@ def create_other_activity_rides(other_points, car_bike_activities):
                     other_rides.append(processed_ride)
                 current_ride_points = []
 
+            if current_ride_points:
+                prev_point = current_ride_points[-1]
+                distance_meters = haversine(prev_point['lat'], prev_point['lon'],
+                                            point['lat'], point['lon']) * 1000
+                if distance_meters >= STATIONARY_THRESHOLD:
+                    last_move_end_tst = point['tst']
+            else:
+                last_move_end_tst = point['tst']
+
             current_ride_points.append(point)
 
         if current_ride_points:
@@ -245,7 +273,7 @@ def calculate_activity_stats(activities):
         filtered_rides = activities.get('_filtered_rides', {'car': 0, 'bike': 0, 'other': 0})
 
         for activity_type, activity_data in activities.items():
-            if activity_type == '_filtered_rides':
+            if activity_type.startswith('_'):
                 continue
 
             total_distance = 0
@@ -254,10 +282,21 @@ def calculate_activity_stats(activities):
 
             for activity in activity_data:
                 points = activity['points']
-                activity_distance = calculate_track_distance(points)
+                # Reuse a distance computed at build time (process_other_ride)
+                # or by a previous stats pass; points never mutate after parse
+                activity_distance = activity.get('distance')
+                if activity_distance is None:
+                    activity_distance = calculate_track_distance(points)
                 stat_start, stat_end = ride_stat_window(activity)
                 activity_duration = stat_end - stat_start
 
+                # Cache per-ride aggregates on the ride dict so endpoints
+                # serving the same rides don't redo the haversine pass
+                activity['distance'] = activity_distance
+                activity['stat_start'] = stat_start
+                activity['stat_end'] = stat_end
+                activity['duration'] = activity_duration
+
                 total_distance += activity_distance
                 total_duration += activity_duration
                 total_points += len(points)
@@ -1,5 +1,9 @@
 import math
-import pytz
+from datetime import datetime, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+import numpy as np
 from timezonefinder import TimezoneFinder
 
 
@@ -20,48 +24,38 @@ def haversine_with_stationary_detection(lat1, lon1, lat2, lon2, stationary_thres
 
 
 def find_movement_boundaries(points, stationary_threshold=10):
+    """Indices of the first and last moving segments, or (None, None).
+
+    One vectorized distance pass replaces the two scalar-haversine scans:
+    segment j is "moving" when points j..j+1 are at least the threshold
+    apart, the start boundary is the first such segment's leading point and
+    the end boundary is the last such segment's trailing point.
+    """
     if len(points) < 2:
         return None, None
 
-    movement_start_idx = None
-    movement_end_idx = None
-
-    for i in range(1, len(points)):
-        prev_point = points[i - 1]
-        curr_point = points[i]
-        distance_meters = haversine(prev_point["lat"], prev_point["lon"],
-                                    curr_point["lat"], curr_point["lon"]) * 1000
-        if distance_meters >= stationary_threshold:
-            movement_start_idx = i - 1
-            break
-
-    for i in range(len(points) - 1, 0, -1):
-        prev_point = points[i - 1]
-        curr_point = points[i]
-        distance_meters = haversine(prev_point["lat"], prev_point["lon"],
-                                    curr_point["lat"], curr_point["lon"]) * 1000
-        if distance_meters >= stationary_threshold:
-            movement_end_idx = i
-            break
+    lat, lon = _point_arrays(points)
+    moving = _moving_mask(lat, lon, stationary_threshold)
+    if not moving.any():
+        return None, None
 
-    return movement_start_idx, movement_end_idx
+    first = int(np.argmax(moving))
+    last = len(moving) - 1 - int(np.argmax(moving[::-1]))
+    return first, last + 1
 
 
 def detect_stationary_gap(points, gap_threshold_seconds, stationary_threshold_meters):
     if len(points) < 2:
         return 0
 
-    stationary_start_idx = len(points) - 1
-
-    for i in range(len(points) - 1, 0, -1):
-        prev_point = points[i - 1]
-        curr_point = points[i]
-        distance_meters = haversine(prev_point["lat"], prev_point["lon"],
-                                    curr_point["lat"], curr_point["lon"]) * 1000
-        if distance_meters >= stationary_threshold_meters:
-            break
-        else:
-            stationary_start_idx = i - 1
+    # Stationary tail starts right after the last moving segment (index 0
+    # when the whole track is stationary)
+    lat, lon = _point_arrays(points)
+    moving = _moving_mask(lat, lon, stationary_threshold_meters)
+    if moving.any():
+        stationary_start_idx = len(moving) - int(np.argmax(moving[::-1]))
+    else:
+        stationary_start_idx = 0
 
     if stationary_start_idx < len(points) - 1:
         return points[-1]['tst'] - points[stationary_start_idx]['tst']
@@ -71,24 +65,138 @@ def detect_stationary_gap(points, gap_threshold_seconds, stationary_threshold_me
 
 ROAD_FACTOR = 1.05
 
+# Segments shorter than this are GPS jitter, not movement (10 m, in km)
+STATIONARY_SEGMENT_KM = 0.01
+
+
+def _segment_distances_km(lat, lon):
+    """Consecutive-pair haversine distances over parallel degree arrays."""
+    lat_rad = np.radians(lat)
+    dlat = np.diff(lat_rad)
+    dlon = np.radians(np.diff(lon))
+    a = (np.sin(dlat / 2) ** 2
+         + np.cos(lat_rad[:-1]) * np.cos(lat_rad[1:]) * np.sin(dlon / 2) ** 2)
+    return 2 * 6371.0 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def _moving_mask(lat, lon, threshold_meters):
+    """Boolean mask of consecutive segments at least threshold_meters long.
+
+    Uses the equirectangular approximation on squared meters: at the ~10 m
+    scales the stationary threshold operates on, it matches haversine to a
+    fraction of a percent while skipping the trig-heavy great-circle math,
+    and the boundary scanners only need the comparison, not the distance.
+    """
+    lat_rad = np.radians(lat)
+    dy = np.diff(lat_rad) * 6371000.0
+    dx = (np.radians(np.diff(lon))
+          * np.cos((lat_rad[:-1] + lat_rad[1:]) / 2) * 6371000.0)
+    return dx * dx + dy * dy >= threshold_meters * threshold_meters
+
+
+def _point_arrays(points, lat_key="lat", lon_key="lon"):
+    """Extract lat/lon from point dicts as parallel float64 arrays."""
+    n = len(points)
+    lat = np.fromiter((p[lat_key] for p in points), np.float64, count=n)
+    lon = np.fromiter((p[lon_key] for p in points), np.float64, count=n)
+    return lat, lon
+
+
+def calculate_track_distance_np(lat, lon):
+    """Vectorized haversine over parallel lat/lon arrays (degrees).
+
+    Returns the same road-adjusted total as the pointwise loop: segments
+    under the stationary threshold are dropped, the rest are summed and
+    scaled by ROAD_FACTOR.
+    """
+    if len(lat) < 2:
+        return 0.0
+    d = _segment_distances_km(lat, lon)
+    return float(d[d >= STATIONARY_SEGMENT_KM].sum() * ROAD_FACTOR)
+
+
+def summarize_ride(points, stationary_threshold=10):
+    """Movement boundaries and road distance from a single haversine pass.
+
+    process_other_ride needs both, and computing them separately extracts
+    the point arrays and runs a distance kernel twice. One set of segment
+    distances yields the moving mask and the road-adjusted total together.
+
+    Returns (start_idx, end_idx, distance_km); the indices are (None, None)
+    when no segment clears the stationary threshold, matching
+    find_movement_boundaries.
+    """
+    if len(points) < 2:
+        return None, None, 0.0
+
+    lat, lon = _point_arrays(points)
+    d = _segment_distances_km(lat, lon)
+    distance = float(d[d >= STATIONARY_SEGMENT_KM].sum() * ROAD_FACTOR)
+
+    moving = d * 1000 >= stationary_threshold
+    if not moving.any():
+        return None, None, distance
+
+    first = int(np.argmax(moving))
+    last = len(moving) - 1 - int(np.argmax(moving[::-1]))
+    return first, last + 1, distance
+
 
 def calculate_track_distance(points, lat_key="lat", lon_key="lon"):
     """Calculate total road-adjusted distance for a list of GPS points."""
-    total = 0
-    for i in range(1, len(points)):
-        d = haversine_with_stationary_detection(
-            points[i - 1][lat_key], points[i - 1][lon_key],
-            points[i][lat_key], points[i][lon_key])
-        total += d * ROAD_FACTOR
-    return total
+    if len(points) < 2:
+        return 0.0
+    lat, lon = _point_arrays(points, lat_key, lon_key)
+    return calculate_track_distance_np(lat, lon)
 
 
-def get_timezone_from_gps(lat, lon):
-    tf = TimezoneFinder()
-    timezone_str = tf.timezone_at(lat=lat, lng=lon)
+@lru_cache(maxsize=32)
+def tz_from_name(name):
+    """ZoneInfo lookup with memoization.
+
+    Every poll and API response resolves the same handful of zone names;
+    the cache keeps the shared instances one dict hit away (they are
+    immutable and safe to share).
+    """
+    return ZoneInfo(name)
+
+
+# Lazy singleton: TimezoneFinder loads ~10 MB of polygon data on
+# construction, so build it once on first use and share it (timezone_at
+# is read-only after init)
+_timezone_finder = None
+
+
+def _get_timezone_finder():
+    global _timezone_finder
+    if _timezone_finder is None:
+        _timezone_finder = TimezoneFinder()
+    return _timezone_finder
+
+
+@lru_cache(maxsize=256)
+def _timezone_for_rounded_gps(lat, lon):
+    timezone_str = _get_timezone_finder().timezone_at(lat=lat, lng=lon)
     if timezone_str:
-        return pytz.timezone(timezone_str)
-    return pytz.UTC
+        return tz_from_name(timezone_str)
+    return timezone.utc
+
+
+def get_timezone_from_gps(lat, lon):
+    # Two decimals is ~1 km, far finer than timezone boundaries, so nearby
+    # fixes share one cached point-in-polygon lookup
+    return _timezone_for_rounded_gps(round(lat, 2), round(lon, 2))
+
+
+@lru_cache(maxsize=8192)
+def format_local_time(tst, tz, fmt):
+    """Localized strftime with memoization.
+
+    The same ride start/end timestamps get formatted again and again across
+    the detect, track and save-map endpoints (and every live poll), so the
+    timezone conversion + strftime is worth caching.
+    """
+    return datetime.fromtimestamp(tst, tz=tz).strftime(fmt)
 
 
 def format_time(seconds_input):
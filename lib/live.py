@@ -4,15 +4,19 @@ Live mode state persistence.
 Handles saving/loading live mode state to disk for persistence
 across container restarts.
 """
-import json
 import os
 
+import orjson
+
 # State file in project root
 LIVE_STATE_FILE = os.path.join(
     os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
     'live_mode_state.json'
 )
 
+# (mtime_ns, parsed state) of the last successful load
+_load_cache = (None, None)
+
 
 def save_live_state(start_timestamp, timezone_name):
     """Save live mode state to disk for persistence across restarts.
@@ -25,8 +29,13 @@ def save_live_state(start_timestamp, timezone_name):
         'start_timestamp': start_timestamp,
         'timezone': timezone_name
     }
-    with open(LIVE_STATE_FILE, 'w') as f:
-        json.dump(state, f)
+    # Write-then-rename so a crash mid-write can't leave a truncated file
+    # for the push worker to read; os.replace is atomic on the same
+    # filesystem. No fsync — the state is regenerable from the UI.
+    tmp_file = LIVE_STATE_FILE + '.tmp'
+    with open(tmp_file, 'wb') as f:
+        f.write(orjson.dumps(state))
+    os.replace(tmp_file, LIVE_STATE_FILE)
 
 
 def load_live_state():
@@ -35,14 +44,27 @@ def load_live_state():
     Returns:
         dict with 'start_timestamp' and 'timezone' keys, or None if no state exists
     """
-    if not os.path.exists(LIVE_STATE_FILE):
+    global _load_cache
+    try:
+        mtime_ns = os.stat(LIVE_STATE_FILE).st_mtime_ns
+    except OSError:
         return None
+
+    # The worker polls this file every cycle but it only changes on
+    # session start/reset; skip the read+parse while the mtime matches.
+    # Safe because saves go through an atomic rename (fresh mtime).
+    if _load_cache[0] == mtime_ns:
+        return _load_cache[1]
+
     try:
-        with open(LIVE_STATE_FILE, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
+        with open(LIVE_STATE_FILE, 'rb') as f:
+            state = orjson.loads(f.read())
+    except (orjson.JSONDecodeError, IOError):
         return None
 
+    _load_cache = (mtime_ns, state)
+    return state
+
 
 def clear_live_state():
     """Remove the live state file."""
@@ -1,13 +1,19 @@
-import json
 import os
+from operator import itemgetter
+
+import orjson
+
+# Markers file in project root; the path never changes at runtime so
+# resolve it once at import instead of per call
+MARKERS_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "GPS_activity_markers.json"
+)
 
 
 def read_activity_markers_file(start_datetime, end_datetime):
     try:
-        script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        markers_file = os.path.join(script_dir, "GPS_activity_markers.json")
-
-        if not os.path.exists(markers_file):
+        if not os.path.exists(MARKERS_FILE):
             return []
 
         start_timestamp = int(start_datetime.timestamp())
@@ -15,13 +21,15 @@ def read_activity_markers_file(start_datetime, end_datetime):
 
         lwt_items = []
 
-        with open(markers_file, 'r', encoding='utf-8') as f:
+        # Binary read + orjson keeps the per-line parse in C and skips a
+        # UTF-8 decode pass; marker lines are tiny so parse cost dominates
+        with open(MARKERS_FILE, 'rb') as f:
             for line in f:
                 line = line.strip()
                 if not line:
                     continue
                 try:
-                    marker = json.loads(line)
+                    marker = orjson.loads(line)
                     if "activity" in marker and "tst" in marker:
                         marker_timestamp = marker["tst"]
                         activity = marker["activity"]
@@ -33,12 +41,12 @@ def read_activity_markers_file(start_datetime, end_datetime):
                                 "activity": activity
                             }
                             lwt_items.append(full_marker)
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     continue
                 except Exception:
                     continue
 
-        lwt_items.sort(key=lambda x: x["tst"])
+        lwt_items.sort(key=itemgetter("tst"))
         return lwt_items
 
     except Exception as e:
@@ -4,14 +4,15 @@ Push notifications via Pushcut webhook.
 Sends iPhone notifications when ride transitions are detected.
 Used by the push worker process, not by the Flask app.
 """
+import queue
+import threading
 import time
 import requests
-from datetime import datetime
-
-import pytz
+from operator import itemgetter
+from requests.adapters import HTTPAdapter, Retry
 
 import config
-from lib.geo import calculate_track_distance, detect_stationary_gap
+from lib.geo import calculate_track_distance, detect_stationary_gap, format_local_time
 from lib.activities import ride_stat_window
 
 
@@ -27,19 +28,72 @@ MARKER_TYPES = {
     'bike_start': 'Bike', 'bike_end': 'Bike',
 }
 
+# The webhook URL comes from the environment and never changes while the
+# process runs, so evaluate it once: with notifications disabled
+# (dev/test) the check_and_notify_* entry points bail before doing any
+# scanning or formatting work.
+_NOTIFY_ENABLED = bool(config.PUSHCUT_WEBHOOK_URL)
+
+# Shared session so consecutive notifications reuse one TLS connection to
+# the Pushcut API instead of paying a full handshake per webhook call.
+# The retries cover transient WAN hiccups; failures still just log.
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(
+    pool_connections=1, pool_maxsize=4,
+    max_retries=Retry(total=2, backoff_factor=0.3)
+))
+
+
+# Notifications are sent from a single background thread so the worker's
+# detection loop never blocks on the webhook (up to 5 s per call). The
+# queue is bounded: if Pushcut is down and it fills up, extra
+# notifications are dropped with a log line rather than stalling polls.
+_send_queue = queue.Queue(maxsize=64)
+_sender_thread = None
+_sender_lock = threading.Lock()
+
+
+def _sender_loop():
+    while True:
+        title, text = _send_queue.get()
+        _post_pushcut(title, text)
+        _send_queue.task_done()
+
+
+def _ensure_sender_thread():
+    global _sender_thread
+    with _sender_lock:
+        if _sender_thread is None or not _sender_thread.is_alive():
+            _sender_thread = threading.Thread(target=_sender_loop, daemon=True)
+            _sender_thread.start()
+
 
 def send_pushcut_notification(title, text):
-    """Send a push notification via Pushcut webhook.
+    """Queue a push notification for the background sender.
 
-    Returns True if sent successfully, False otherwise.
-    Never raises — all exceptions are caught and logged.
+    Returns True if queued, False if notifications are disabled or the
+    queue is full. Never raises — delivery is best-effort.
     """
+    if not config.PUSHCUT_WEBHOOK_URL:
+        return False
+
+    _ensure_sender_thread()
+    try:
+        _send_queue.put_nowait((title, text))
+        return True
+    except queue.Full:
+        print(f"[PUSHCUT] Queue full, dropped: {title}", flush=True)
+        return False
+
+
+def _post_pushcut(title, text):
+    """Blocking webhook POST; runs only on the sender thread."""
     url = config.PUSHCUT_WEBHOOK_URL
     if not url:
         return False
 
     try:
-        response = requests.post(url, json={
+        response = _session.post(url, json={
             'title': title,
             'text': text,
             'isTimeSensitive': True
@@ -60,7 +114,12 @@ def format_ride_end_text(ride, detected_tz):
 
     Returns string like: "12.5 km | 35m | 21.4 km/h | 14:32-15:07"
     """
-    distance = calculate_track_distance(ride['points'])
+    # Rides built by process_other_ride or passed through
+    # calculate_activity_stats carry their distance already; only compute
+    # the haversine pass for rides that never went through either
+    distance = ride.get('distance')
+    if distance is None:
+        distance = calculate_track_distance(ride['points'])
     stat_start, stat_end = ride_stat_window(ride)
     duration = stat_end - stat_start
     avg_speed = (distance / duration * 3600) if duration > 0 else 0
@@ -73,14 +132,27 @@ def format_ride_end_text(ride, detected_tz):
     else:
         duration_str = f"{duration_min}m"
 
-    start_local = datetime.fromtimestamp(stat_start, tz=pytz.UTC).astimezone(detected_tz)
-    end_local = datetime.fromtimestamp(stat_end, tz=pytz.UTC).astimezone(detected_tz)
-
     return (f"{distance:.1f} km | {duration_str} | {avg_speed:.1f} km/h | "
-            f"{start_local.strftime('%H:%M')}-{end_local.strftime('%H:%M')}")
+            f"{format_local_time(stat_start, detected_tz, '%H:%M')}-"
+            f"{format_local_time(stat_end, detected_tz, '%H:%M')}")
 
 
-def check_and_notify_markers(raw_data, seen_markers, activities, detected_tz):
+def _suppress_if_historical(now, event_timestamp, description):
+    """Log and return True when an event is too old to notify about.
+
+    One shared guard for every transition path, so the threshold and the
+    suppression log format live in a single place.
+    """
+    age = now - event_timestamp
+    if age > HISTORICAL_THRESHOLD_SECONDS:
+        print(f"[PUSH-WORKER] Suppressed: {description} — "
+              f"{age // 60}m ago — historical event", flush=True)
+        return True
+    return False
+
+
+def check_and_notify_markers(raw_data, seen_markers, activities, detected_tz,
+                             now=None):
     """Scan raw data for new car/bike markers and send notifications.
 
     Detects car_start, car_end, bike_start, bike_end markers directly from
@@ -89,18 +161,42 @@ def check_and_notify_markers(raw_data, seen_markers, activities, detected_tz):
 
     Returns (updated_seen_markers, state_changed).
     """
-    now = int(time.time())
-    new_seen = set(seen_markers)
+    if not _NOTIFY_ENABLED:
+        return seen_markers, False
+
+    if now is None:
+        now = int(time.time())
+    # Copy-on-write: most polls carry no unseen markers, so skip the
+    # O(seen) set copy until something actually needs adding
+    new_seen = seen_markers
     state_changed = False
 
     # Collect car/bike markers from raw data, sorted by timestamp
-    markers = []
-    for item in raw_data:
-        if item.get('_type') == 'lwt' and item.get('custom') is True:
-            activity = item.get('activity', '')
-            if activity in MARKER_TYPES:
-                markers.append(item)
-    markers.sort(key=lambda x: x['tst'])
+    markers = sorted(
+        (item for item in raw_data
+         if item.get('_type') == 'lwt' and item.get('custom') is True
+         and item.get('activity') in MARKER_TYPES),
+        key=itemgetter('tst'))
+
+    # Ride end timestamps are marker-derived ints, so matching a marker to
+    # its ride is a handful of dict probes over the +/-5 s window instead
+    # of a scan through every ride per marker. Built lazily per ride type;
+    # setdefault keeps the first ride for an end time, like the old scan.
+    end_indices = {}
+
+    def _ride_ending_near(ride_type, rides, tst):
+        idx_map = end_indices.get(ride_type)
+        if idx_map is None:
+            idx_map = {}
+            for idx, r in enumerate(rides):
+                idx_map.setdefault(r['end'], idx)
+            end_indices[ride_type] = idx_map
+        candidates = [idx_map[tst + offset] for offset in range(-4, 5)
+                      if tst + offset in idx_map]
+        if not candidates:
+            return None, None
+        idx = min(candidates)
+        return rides[idx], idx + 1
 
     for marker in markers:
         activity = marker['activity']
@@ -111,14 +207,13 @@ def check_and_notify_markers(raw_data, seen_markers, activities, detected_tz):
         # Skip already-seen markers
         if tst in new_seen:
             continue
+        if new_seen is seen_markers:
+            new_seen = set(seen_markers)
         new_seen.add(tst)
         state_changed = True
 
         # Historical event suppression
-        age = now - tst
-        if age > HISTORICAL_THRESHOLD_SECONDS:
-            print(f"[PUSH-WORKER] Suppressed: {name} marker at {tst} — "
-                  f"{age // 60}m ago — historical event", flush=True)
+        if _suppress_if_historical(now, tst, f"{name} marker at {tst}"):
             continue
 
         # Ride numbering from validated activities (matches map app)
@@ -127,21 +222,14 @@ def check_and_notify_markers(raw_data, seen_markers, activities, detected_tz):
         if activity.endswith('_start'):
             # Ride may not be validated yet (< 5 GPS points), so next number
             ride_number = len(rides) + 1
-            start_local = datetime.fromtimestamp(
-                tst, tz=pytz.UTC).astimezone(detected_tz)
             send_pushcut_notification(
                 f"{name} Ride {ride_number} Started",
-                f"Started at {start_local.strftime('%H:%M')}")
+                f"Started at {format_local_time(tst, detected_tz, '%H:%M')}")
 
         elif activity.endswith('_end'):
             # Find matching ride by end timestamp for stats and numbering
-            ride = None
-            for idx, r in enumerate(rides):
-                if abs(r['end'] - tst) < 5:
-                    ride = r
-                    ride_number = idx + 1
-                    break
-            else:
+            ride, ride_number = _ride_ending_near(ride_type, rides, tst)
+            if ride is None:
                 ride_number = len(rides) + 1
 
             if ride and ride.get('points'):
@@ -149,11 +237,9 @@ def check_and_notify_markers(raw_data, seen_markers, activities, detected_tz):
                     f"{name} Ride {ride_number} Ended",
                     format_ride_end_text(ride, detected_tz))
             else:
-                end_local = datetime.fromtimestamp(
-                    tst, tz=pytz.UTC).astimezone(detected_tz)
                 send_pushcut_notification(
                     f"{name} Ride {ride_number} Ended",
-                    f"Ended at {end_local.strftime('%H:%M')}")
+                    f"Ended at {format_local_time(tst, detected_tz, '%H:%M')}")
 
     return new_seen, state_changed
 
@@ -182,13 +268,24 @@ def is_other_ride_ended(ride):
     points = ride.get('points', [])
     if len(points) < 2:
         return False
+
+    # Only the trailing threshold window can change the answer: any
+    # movement inside it means the gap is under threshold, and none means
+    # it's at least the threshold. Walk back to the window edge (plus one
+    # boundary point) instead of scanning the whole ride every poll.
+    cutoff = points[-1]['tst'] - OTHER_STATIONARY_END_SECONDS
+    i = len(points) - 1
+    while i > 0 and points[i]['tst'] >= cutoff:
+        i -= 1
+
     stationary = detect_stationary_gap(
-        points, OTHER_STATIONARY_END_SECONDS, 10)
+        points[i:], OTHER_STATIONARY_END_SECONDS, 10)
     return stationary >= OTHER_STATIONARY_END_SECONDS
 
 
 def check_and_notify_other_transitions(prev_count, new_count, activities,
-                                       detected_tz, last_gps_timestamp):
+                                       detected_tz, last_gps_timestamp,
+                                       now=None):
     """Handle walking/other ride count changes.
 
     Walking rides have no markers, so transitions are detected from
@@ -199,10 +296,11 @@ def check_and_notify_other_transitions(prev_count, new_count, activities,
     "Ended" for active walking rides is handled separately by the worker
     via stationary gap check (check_and_notify_other_ride_end).
     """
-    if new_count <= prev_count:
+    if not _NOTIFY_ENABLED or new_count <= prev_count:
         return
 
-    now = int(time.time())
+    if now is None:
+        now = int(time.time())
     rides = activities.get('other', [])
     ride = rides[-1] if rides else None
     if not ride:
@@ -212,27 +310,17 @@ def check_and_notify_other_transitions(prev_count, new_count, activities,
 
     if _is_other_ride_active(ride, last_gps_timestamp):
         # Currently walking — send "Started"
-        event_timestamp = ride['start']
-        age = now - event_timestamp
-
-        if age > HISTORICAL_THRESHOLD_SECONDS:
-            print(f"[PUSH-WORKER] Suppressed: Walking Ride {ride_number} "
-                  f"started {age // 60}m ago — historical event", flush=True)
+        if _suppress_if_historical(
+                now, ride['start'], f"Walking Ride {ride_number} started"):
             return
 
-        start_local = datetime.fromtimestamp(
-            ride['start'], tz=pytz.UTC).astimezone(detected_tz)
         send_pushcut_notification(
             f"Walking Ride {ride_number} Started",
-            f"Started at {start_local.strftime('%H:%M')}")
+            f"Started at {format_local_time(ride['start'], detected_tz, '%H:%M')}")
     else:
         # Completed segment appeared (split from previous) — send "Ended"
-        event_timestamp = ride['end']
-        age = now - event_timestamp
-
-        if age > HISTORICAL_THRESHOLD_SECONDS:
-            print(f"[PUSH-WORKER] Suppressed: Walking Ride {ride_number} "
-                  f"ended {age // 60}m ago — historical event", flush=True)
+        if _suppress_if_historical(
+                now, ride['end'], f"Walking Ride {ride_number} ended"):
             return
 
         send_pushcut_notification(
@@ -240,7 +328,7 @@ def check_and_notify_other_transitions(prev_count, new_count, activities,
             format_ride_end_text(ride, detected_tz))
 
 
-def check_and_notify_other_ride_end(ride, ride_number, detected_tz):
+def check_and_notify_other_ride_end(ride, ride_number, detected_tz, now=None):
     """Check if a walking/other ride has ended and send notification.
 
     Called by the worker on every poll for active walking rides that haven't
@@ -253,13 +341,17 @@ def check_and_notify_other_ride_end(ride, ride_number, detected_tz):
     if not is_other_ride_ended(ride):
         return False
 
-    now = int(time.time())
-    event_timestamp = ride['end']
-    age = now - event_timestamp
+    if not _NOTIFY_ENABLED:
+        # The ride really ended; nothing to send, but report it handled
+        # so the caller stops re-checking. Returning True any earlier
+        # would mark a still-moving ride as ended and make the worker's
+        # notified/reset pair toggle (and persist state) on every poll.
+        return True
 
-    if age > HISTORICAL_THRESHOLD_SECONDS:
-        print(f"[PUSH-WORKER] Suppressed: Walking Ride {ride_number} "
-              f"ended {age // 60}m ago — historical event", flush=True)
+    if now is None:
+        now = int(time.time())
+    if _suppress_if_historical(
+            now, ride['end'], f"Walking Ride {ride_number} ended"):
         return True
 
     send_pushcut_notification(
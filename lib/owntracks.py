@@ -1,13 +1,28 @@
+import orjson
 import requests
-import pytz
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from requests.adapters import HTTPAdapter, Retry
 
+from lib.geo import tz_from_name
 from lib.markers import read_activity_markers_file
 
 # The recorder needs roughly 5 seconds per day of data, so a wide range in a
 # single request runs past the timeout. Fetch in slices instead.
 CHUNK_DAYS = 3
-REQUEST_TIMEOUT = 60
+
+# Connect fast-fails (the recorder is on the local network); the read
+# timeout stays generous because of the ~5s/day response time above.
+REQUEST_TIMEOUT = (5, 60)
+
+# Shared session with keep-alive so the chunked fetches (and back-to-back
+# calls from the detect endpoint) reuse one TCP connection to the recorder.
+# A couple of quick retries smooth over transient recorder hiccups without
+# turning a real outage into a long stall.
+_session = requests.Session()
+_session.mount('http://', HTTPAdapter(
+    pool_connections=4, pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.2)
+))
 
 
 def fetch_owntracks_data(start_date_str, end_date_str, start_time="00:00", end_time="23:59",
@@ -23,10 +38,10 @@ def fetch_owntracks_data(start_date_str, end_date_str, start_time="00:00", end_t
         if target_timezone:
             local_tz = target_timezone
         else:
-            local_tz = pytz.timezone(default_timezone)
+            local_tz = tz_from_name(default_timezone)
 
-        start_datetime = local_tz.localize(start_datetime)
-        end_datetime = local_tz.localize(end_datetime)
+        start_datetime = start_datetime.replace(tzinfo=local_tz)
+        end_datetime = end_datetime.replace(tzinfo=local_tz)
 
         all_data = []
         upstream_status = "available"
@@ -44,16 +59,18 @@ def fetch_owntracks_data(start_date_str, end_date_str, start_time="00:00", end_t
             locations_params = {
                 "user": user,
                 "device": device_id,
-                "from": chunk_start.astimezone(pytz.UTC).strftime("%Y-%m-%dT%H:%M:%SZ"),
-                "to": chunk_end.astimezone(pytz.UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+                "from": chunk_start.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "to": chunk_end.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
             }
 
             chunk_ok = False
             try:
-                response = requests.get(locations_url, params=locations_params,
+                response = _session.get(locations_url, params=locations_params,
                                         timeout=REQUEST_TIMEOUT)
                 if response.status_code == 200:
-                    data = response.json()
+                    # orjson is noticeably faster than response.json() on
+                    # multi-day location payloads
+                    data = orjson.loads(response.content)
                     if data.get("status") == 200 and isinstance(data.get("data"), list):
                         for item in data["data"]:
                             key = (item.get("tst"), item.get("lat"), item.get("lon"))
@@ -17,26 +17,34 @@ Shares no in-memory state with the Flask app. Communicates only through:
 Usage:
     python -m lib.push_worker
 """
-import json
+import logging
 import os
 import random
+import sys
 import time
 from datetime import datetime
 
-import pytz
+import orjson
 
 import config
-from lib.geo import get_timezone_from_gps
+from lib.geo import get_timezone_from_gps, tz_from_name
 from lib.live import load_live_state
 from lib.owntracks import fetch_owntracks_data
 from lib.activities import parse_activities
 from lib.notifications import (
+    MARKER_TYPES,
     check_and_notify_markers,
     check_and_notify_other_transitions,
     check_and_notify_other_ride_end,
     is_other_ride_ended,
 )
 
+# Worker logging goes through a module logger instead of flushed prints:
+# %-style arguments are only formatted when the record is actually
+# emitted, so dropping the level below INFO silences the per-poll
+# heartbeat without paying for its string construction.
+log = logging.getLogger('push_worker')
+
 
 # Worker state file path
 WORKER_STATE_FILE = os.path.join(
@@ -48,6 +56,19 @@ POLL_INTERVAL = 30  # seconds
 POLL_JITTER = (3, 7)  # random jitter range in seconds
 WAIT_FOR_SESSION = 60  # seconds to wait when no live session exists
 
+# Back off the poll cadence after consecutive polls with no new data,
+# mirroring the live endpoint's steps: 2x after 3 idle polls, 4x after 6.
+# Capped at 2 minutes so a ride start is never noticed much later.
+POLL_BACKOFF_STEPS = [(6, 4), (3, 2)]
+
+
+def _poll_interval(idle_polls):
+    """Seconds until the next poll, stretched while nothing is happening."""
+    for threshold, multiplier in POLL_BACKOFF_STEPS:
+        if idle_polls >= threshold:
+            return POLL_INTERVAL * multiplier
+    return POLL_INTERVAL
+
 
 def load_worker_state():
     """Load worker state from disk.
@@ -58,17 +79,26 @@ def load_worker_state():
     if not os.path.exists(WORKER_STATE_FILE):
         return None
     try:
-        with open(WORKER_STATE_FILE, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
+        with open(WORKER_STATE_FILE, 'rb') as f:
+            return orjson.loads(f.read())
+    except (orjson.JSONDecodeError, IOError):
         return None
 
 
 def save_worker_state(state):
-    """Save worker state to disk atomically (write to temp, then rename)."""
+    """Save worker state to disk atomically (write to temp, then rename).
+
+    Unlike the live-mode state, this file is not regenerable: losing it
+    after a crash replays notifications for markers already announced, so
+    fsync before the rename to make the write durable. Writes only happen
+    when state actually changed, so the cost is per transition, not per
+    poll.
+    """
     tmp_path = WORKER_STATE_FILE + '.tmp'
-    with open(tmp_path, 'w') as f:
-        json.dump(state, f)
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(state))
+        f.flush()
+        os.fsync(f.fileno())
     os.replace(tmp_path, WORKER_STATE_FILE)
 
 
@@ -77,23 +107,44 @@ def _build_state_dict(session_start_timestamp, detected_tz, seen_markers,
     """Build the state dict for saving."""
     return {
         'session_start_timestamp': session_start_timestamp,
-        'detected_tz': detected_tz.zone,
+        'detected_tz': str(detected_tz),
         'seen_marker_timestamps': list(seen_markers),
         'prev_other_count': prev_other_count,
         'other_ended_notified': other_ended_notified,
     }
 
 
+# Single-entry memo for the fetch window strings: the window is only
+# minute-resolved, so polls landing in the same minute with the same
+# watermark reuse the previous conversion
+_window_memo = (None, None)
+
+
+def _fetch_window_strings(from_timestamp, to_timestamp, detected_tz):
+    """Date/time strings for the fetch window, memoized per minute."""
+    global _window_memo
+    key = (from_timestamp, to_timestamp // 60, str(detected_tz))
+    if _window_memo[0] == key:
+        return _window_memo[1]
+
+    from_dt = datetime.fromtimestamp(from_timestamp, tz=detected_tz)
+    to_dt = datetime.fromtimestamp(to_timestamp, tz=detected_tz)
+    strings = (from_dt.strftime('%Y-%m-%d'), to_dt.strftime('%Y-%m-%d'),
+               from_dt.strftime('%H:%M'), to_dt.strftime('%H:%M'))
+    _window_memo = (key, strings)
+    return strings
+
+
 def _fetch_data(from_timestamp, to_timestamp, detected_tz):
     """Fetch OwnTracks data between two timestamps."""
-    from_dt = datetime.fromtimestamp(from_timestamp, tz=pytz.UTC).astimezone(detected_tz)
-    to_dt = datetime.fromtimestamp(to_timestamp, tz=pytz.UTC).astimezone(detected_tz)
+    from_date, to_date, from_time, to_time = _fetch_window_strings(
+        from_timestamp, to_timestamp, detected_tz)
 
     return fetch_owntracks_data(
-        from_dt.strftime('%Y-%m-%d'),
-        to_dt.strftime('%Y-%m-%d'),
-        from_dt.strftime('%H:%M'),
-        to_dt.strftime('%H:%M'),
+        from_date,
+        to_date,
+        from_time,
+        to_time,
         server_ip=config.OWNTRACKS_SERVER_IP,
         server_port=config.OWNTRACKS_SERVER_PORT,
         user=config.OWNTRACKS_USER,
@@ -105,16 +156,23 @@ def _fetch_data(from_timestamp, to_timestamp, detected_tz):
 
 def run():
     """Main worker loop."""
-    print("[PUSH-WORKER] Starting push notification worker", flush=True)
+    logging.basicConfig(stream=sys.stdout, level=logging.INFO,
+                        format='[PUSH-WORKER] %(message)s')
+    log.info("Starting push notification worker")
 
     if not config.PUSHCUT_WEBHOOK_URL:
-        print("[PUSH-WORKER] PUSHCUT_WEBHOOK_URL not set — notifications disabled", flush=True)
+        log.warning("PUSHCUT_WEBHOOK_URL not set — notifications disabled")
 
     # In-memory accumulated data (lost on restart, rebuilt from catch-up fetch)
     raw_data = []
     existing_timestamps = set()
+    # Parse results reused across polls when nothing new arrives
+    gps_points = []
+    activities = {}
+    parsed_once = False
+    idle_polls = 0
     last_poll_timestamp = None
-    detected_tz = pytz.timezone(config.DEFAULT_TIMEZONE)
+    detected_tz = tz_from_name(config.DEFAULT_TIMEZONE)
     session_start_timestamp = None
 
     # Load persisted state
@@ -130,10 +188,10 @@ def run():
         other_ended_notified = worker_state.get('other_ended_notified', False)
         session_start_timestamp = worker_state.get('session_start_timestamp')
         tz_name = worker_state.get('detected_tz', config.DEFAULT_TIMEZONE)
-        detected_tz = pytz.timezone(tz_name)
+        detected_tz = tz_from_name(tz_name)
         first_run = False
-        print(f"[PUSH-WORKER] Loaded state: {len(seen_markers)} seen markers, "
-              f"other_count={prev_other_count}", flush=True)
+        log.info("Loaded state: %d seen markers, other_count=%d",
+                 len(seen_markers), prev_other_count)
 
     while True:
         try:
@@ -141,25 +199,29 @@ def run():
             live_state = load_live_state()
 
             if not live_state:
-                print("[PUSH-WORKER] No live session yet — waiting", flush=True)
+                log.info("No live session yet — waiting")
                 time.sleep(WAIT_FOR_SESSION)
                 continue
 
             live_start = live_state['start_timestamp']
             live_tz_name = live_state.get('timezone', config.DEFAULT_TIMEZONE)
-            live_tz = pytz.timezone(live_tz_name)
+            live_tz = tz_from_name(live_tz_name)
 
             # Detect session reset
             if session_start_timestamp != live_start:
                 if session_start_timestamp is not None:
-                    print(f"[PUSH-WORKER] Session reset detected — reinitializing", flush=True)
+                    log.info("Session reset detected — reinitializing")
                 else:
-                    print(f"[PUSH-WORKER] Starting session from {live_start}", flush=True)
+                    log.info("Starting session from %d", live_start)
 
                 session_start_timestamp = live_start
                 detected_tz = live_tz
                 raw_data = []
                 existing_timestamps = set()
+                gps_points = []
+                activities = {}
+                parsed_once = False
+                idle_polls = 0
                 last_poll_timestamp = None
                 seen_markers = set()
                 prev_other_count = 0
@@ -172,7 +234,7 @@ def run():
             if last_poll_timestamp is None:
                 # First poll — catch-up fetch from session start
                 fetch_from = session_start_timestamp
-                print(f"[PUSH-WORKER] Catch-up fetch from session start", flush=True)
+                log.info("Catch-up fetch from session start")
             else:
                 fetch_from = last_poll_timestamp
 
@@ -180,19 +242,35 @@ def run():
             new_data = _fetch_data(fetch_from, now, detected_tz)
 
             new_points = []
+            merged_new_items = False
             if new_data:
-                # Filter new GPS points
-                for item in new_data:
-                    if (item.get('_type') == 'location'
-                            and item.get('tst', 0) > (last_poll_timestamp or 0)):
-                        new_points.append(item)
-
-                # Merge into accumulated raw_data (dedup by timestamp)
+                # One pass collects the new GPS points and merges into the
+                # accumulated buffer. The dedup set stays (rather than a
+                # pure tst high-watermark) because the watermark only
+                # advances on GPS fixes, and a marker landing exactly on it
+                # from the overlapping refetch window must not be dropped;
+                # the set costs nothing extra while raw_data itself is kept.
+                watermark = last_poll_timestamp or 0
+                newest_point_tst = watermark
                 for item in new_data:
                     tst = item.get('tst')
+                    item_type = item.get('_type')
+                    if item_type == 'location' and (tst or 0) > watermark:
+                        new_points.append(item)
+                        if tst > newest_point_tst:
+                            newest_point_tst = tst
                     if tst not in existing_timestamps:
                         raw_data.append(item)
                         existing_timestamps.add(tst)
+                        # Only GPS fixes and custom markers can change the
+                        # parse or trigger a notification — the same filter
+                        # parse_activities applies. Background LWT pings
+                        # with fresh timestamps are kept in the buffer but
+                        # don't wake the pipeline or reset the idle backoff.
+                        if item_type == 'location' or (
+                                item_type == 'lwt'
+                                and item.get('custom') is True):
+                            merged_new_items = True
 
             # Update timezone from first GPS point if needed
             if not any(item.get('_type') == 'location' for item in raw_data[:1]):
@@ -203,22 +281,27 @@ def run():
                     detected_tz = get_timezone_from_gps(
                         first_point['lat'], first_point['lon'])
 
-            # Re-parse all activities from full accumulated data
-            raw_data.sort(key=lambda x: x.get('tst', 0))
-            gps_points, activities = parse_activities(raw_data)
+            # Re-parse activities only when the accumulated buffer actually
+            # changed; idle polls reuse the previous parse (same pattern as
+            # the Flask live endpoint)
+            if merged_new_items or not parsed_once:
+                raw_data.sort(key=lambda x: x.get('tst', 0))
+                gps_points, activities = parse_activities(raw_data)
+                parsed_once = True
 
             # Advance last_poll_timestamp only if new points arrived
             if new_points:
-                last_point_tst = max(p.get('tst', 0) for p in new_points)
-                last_poll_timestamp = last_point_tst
+                last_poll_timestamp = newest_point_tst
 
             # On first run, initialize baseline without sending notifications
             if first_run:
-                # Collect all existing markers into seen set
+                # Collect all existing markers into seen set; MARKER_TYPES
+                # is the notifier's own car/bike marker table, so the
+                # baseline and the live scan can never disagree on what
+                # counts as a marker
                 for item in raw_data:
                     if (item.get('_type') == 'lwt' and item.get('custom') is True
-                            and item.get('activity', '') in
-                            ('car_start', 'car_end', 'bike_start', 'bike_end')):
+                            and item.get('activity') in MARKER_TYPES):
                         seen_markers.add(item['tst'])
 
                 new_other_count = len(activities.get('other', []))
@@ -228,16 +311,20 @@ def run():
                 save_worker_state(_build_state_dict(
                     session_start_timestamp, detected_tz, seen_markers,
                     prev_other_count, other_ended_notified))
-                print(f"[PUSH-WORKER] Initialized baseline: "
-                      f"{len(seen_markers)} markers, "
-                      f"other_count={prev_other_count}, "
-                      f"points={len(gps_points)}", flush=True)
-            else:
+                log.info("Initialized baseline: %d markers, other_count=%d, "
+                         "points=%d", len(seen_markers), prev_other_count,
+                         len(gps_points))
+            elif merged_new_items:
+                # Transitions can only come from new markers or points, so
+                # idle polls skip the notifier pipeline and state save too
                 state_changed = False
+                # One wall-clock read per poll keeps the historical checks
+                # consistent across all three notifiers
+                now = int(time.time())
 
                 # Car/bike: scan for new markers (immediate notification)
                 seen_markers, markers_changed = check_and_notify_markers(
-                    raw_data, seen_markers, activities, detected_tz)
+                    raw_data, seen_markers, activities, detected_tz, now=now)
                 if markers_changed:
                     state_changed = True
 
@@ -248,18 +335,24 @@ def run():
                 if new_other_count != prev_other_count:
                     check_and_notify_other_transitions(
                         prev_other_count, new_other_count, activities,
-                        detected_tz, last_gps_tst)
+                        detected_tz, last_gps_tst, now=now)
                     prev_other_count = new_other_count
                     other_ended_notified = False
                     state_changed = True
 
-                # Walking/other: stationary gap end detection
+                # Walking/other: stationary gap end detection. Skipped
+                # entirely when notifications are disabled — the
+                # notified/reset bookkeeping only exists to time a send,
+                # so without a webhook there is nothing to track and no
+                # reason to run the gap check every poll.
                 other_rides = activities.get('other', [])
-                if other_rides and last_gps_tst > 0:
+                if (other_rides and last_gps_tst > 0
+                        and config.PUSHCUT_WEBHOOK_URL):
                     last_other = other_rides[-1]
                     if not other_ended_notified:
                         if check_and_notify_other_ride_end(
-                                last_other, len(other_rides), detected_tz):
+                                last_other, len(other_rides), detected_tz,
+                                now=now):
                             other_ended_notified = True
                             state_changed = True
                     elif not is_other_ride_ended(last_other):
@@ -272,18 +365,20 @@ def run():
                         session_start_timestamp, detected_tz, seen_markers,
                         prev_other_count, other_ended_notified))
 
+            idle_polls = 0 if merged_new_items else idle_polls + 1
+
             total_points = len(gps_points)
             other_count = len(activities.get('other', []))
-            print(f"[PUSH-WORKER] Poll: {len(new_points)} new points, "
-                  f"{total_points} total, markers_seen={len(seen_markers)}, "
-                  f"other_count={other_count}", flush=True)
+            log.info("Poll: %d new points, %d total, markers_seen=%d, "
+                     "other_count=%d", len(new_points), total_points,
+                     len(seen_markers), other_count)
 
         except Exception as e:
-            print(f"[PUSH-WORKER] Error in poll cycle: {e}", flush=True)
+            log.error("Error in poll cycle: %s", e)
 
-        # Sleep with jitter
+        # Sleep with jitter, backing off while idle
         jitter = random.uniform(*POLL_JITTER)
-        time.sleep(POLL_INTERVAL + jitter)
+        time.sleep(_poll_interval(idle_polls) + jitter)
 
 
 if __name__ == '__main__':
@@ -1678,6 +1678,18 @@ function startLiveMode() {
     });
 }
 
+// The poll endpoint sends point batches as parallel arrays
+// ({lat: [...], lng: [...], tst: [...]}) to halve the JSON size;
+// expand back to point objects here so the rest of the code is unchanged.
+function soaToPoints(soa) {
+    var points = [];
+    if (!soa || !soa.tst) return points;
+    for (var i = 0; i < soa.tst.length; i++) {
+        points.push({ lat: soa.lat[i], lng: soa.lng[i], tst: soa.tst[i] });
+    }
+    return points;
+}
+
 function schedulePoll(delayMs) {
     clearTimeout(pollTimer);
     pollTimer = setTimeout(pollLiveData, delayMs);
@@ -1980,7 +1992,7 @@ function handleSuccessfulLivePoll(data) {
         return;
     }
 
-    var batch = getDelayedBatchInfo(data.new_points);
+    var batch = getDelayedBatchInfo(soaToPoints(data.new_points));
     if (batch) {
         setTrackingDiagnostic('batch', {
             message: batch.count + ' older GPS points arrived together. The newest is ' +
@@ -2083,6 +2095,15 @@ function pollLiveData() {
 
         handleSuccessfulLivePoll(data);
 
+        // Idle heartbeat: the server confirmed nothing changed, so keep the
+        // current render and just refresh the poll bookkeeping.
+        if (data.unchanged) {
+            document.getElementById('live-last-update').textContent = new Date().toLocaleTimeString();
+            schedulePoll(data.next_poll_interval_ms || (POLL_PERIOD_S * 1000));
+            updateLastFixAge();
+            return;
+        }
+
         // Update cached data
         liveData = Object.assign(liveData || {}, data);
         updateLiveUI(data);
@@ -2119,25 +2140,28 @@ function pollLiveData() {
 
         // Draw points to the simple live polyline (for real-time updates)
         // Note: Activity points will be redrawn by refreshLiveActivityLayers
-        if (data.points_to_draw && data.points_to_draw.length > 0) {
+        var pointsToDraw = soaToPoints(data.points_to_draw);
+        if (pointsToDraw.length > 0) {
             // Only append to map if not in history mode
             if (!historyModeActive) {
-                appendLivePoints(data.points_to_draw);
+                appendLivePoints(pointsToDraw);
             }
             // Update lastDrawnTimestamp to the last point we drew
-            var lastPoint = data.points_to_draw[data.points_to_draw.length - 1];
-            lastDrawnTimestamp = lastPoint.tst;
+            lastDrawnTimestamp = pointsToDraw[pointsToDraw.length - 1].tst;
 
             // Add points to history tracking and calculate cumulative stats
-            addPointsToHistory(data.points_to_draw);
+            addPointsToHistory(pointsToDraw);
         }
 
         // Update history panel display
         updateHistoryPanel();
 
-        // Phase 18: schedule next poll aligned to next expected fix (or retry after one cycle)
-        var hasNewData = data.points_to_draw && data.points_to_draw.length > 0;
-        schedulePoll(hasNewData ? computeAlignedDelay() : POLL_PERIOD_S * 1000);
+        // Phase 18: schedule next poll aligned to next expected fix. On empty
+        // polls, honor the server's adaptive backoff (65s stretching to 2-4x
+        // during idle stretches); fresh data snaps back to the aligned cadence.
+        var hasNewData = pointsToDraw.length > 0;
+        var idleDelay = data.next_poll_interval_ms || (POLL_PERIOD_S * 1000);
+        schedulePoll(hasNewData ? computeAlignedDelay() : idleDelay);
 
         // Phase 19: restore ⊙ age-based color now that poll is complete
         updateLastFixAge();
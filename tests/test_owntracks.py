@@ -17,10 +17,10 @@ class FetchOwnTracksStatusTests(unittest.TestCase):
         }
 
     @patch("lib.owntracks.read_activity_markers_file", return_value=[])
-    @patch("lib.owntracks.requests.get")
+    @patch("lib.owntracks._session.get")
     def test_reachable_empty_response_is_available(self, get, _markers):
         response = Mock(status_code=200)
-        response.json.return_value = {"status": 200, "data": []}
+        response.content = b'{"status": 200, "data": []}'
         get.return_value = response
 
         data, status = fetch_owntracks_data(**self.kwargs)
@@ -29,7 +29,7 @@ class FetchOwnTracksStatusTests(unittest.TestCase):
         self.assertEqual(status, "available")
 
     @patch("lib.owntracks.read_activity_markers_file", return_value=[])
-    @patch("lib.owntracks.requests.get")
+    @patch("lib.owntracks._session.get")
     def test_request_failure_is_unavailable(self, get, _markers):
         get.side_effect = requests.ConnectionError("unreachable")
 
@@ -39,10 +39,10 @@ class FetchOwnTracksStatusTests(unittest.TestCase):
         self.assertEqual(status, "unavailable")
 
     @patch("lib.owntracks.read_activity_markers_file", return_value=[])
-    @patch("lib.owntracks.requests.get")
+    @patch("lib.owntracks._session.get")
     def test_legacy_caller_still_receives_data_only(self, get, _markers):
         response = Mock(status_code=200)
-        response.json.return_value = {"status": 200, "data": []}
+        response.content = b'{"status": 200, "data": []}'
         get.return_value = response
         legacy_kwargs = dict(self.kwargs)
         legacy_kwargs.pop("return_status")